@@ -8,15 +8,48 @@ import logging
 import os
 import sys
 import traceback
-from http.server import HTTPServer, BaseHTTPRequestHandler
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
 from urllib.parse import urlparse
-from urllib.request import Request, urlopen
-from urllib.error import URLError, HTTPError
+
+import requests
+from requests.adapters import HTTPAdapter
+
+from ttl_cache import TTLCache
+
+# Optional: faster JSON encoding/decoding than the stdlib json module
+try:
+    import orjson
+except ImportError:
+    orjson = None
 
 # Configure logging
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
 logger = logging.getLogger(__name__)
 
+def encode_json(obj, sort_keys=False, default=None):
+    """Serialize obj to UTF-8 JSON bytes, using orjson when it is installed"""
+    if orjson is not None:
+        return orjson.dumps(obj, default=default, option=orjson.OPT_SORT_KEYS if sort_keys else 0)
+    return json.dumps(obj, default=default, sort_keys=sort_keys).encode('utf-8')
+
+def decode_json(data):
+    """Parse JSON bytes or text, using orjson when it is installed"""
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
+# One keep-alive connection pool shared by every request thread, so repeated
+# calls to the cloud backend skip the TCP/TLS handshake
+http_session = requests.Session()
+http_session.mount('http://', HTTPAdapter(pool_maxsize=16))
+http_session.mount('https://', HTTPAdapter(pool_maxsize=16))
+
+# Cloud DFM results are reused when unchanged geometry is analysed again with
+# the same requirements; keyed by (endpoint, canonical request JSON bytes)
+DFM_CACHE_TTL = 1800
+DFM_CACHE_SIZE = 256
+dfm_cache = TTLCache(DFM_CACHE_SIZE, DFM_CACHE_TTL)
+
 class CloudDFMProxy:
     """Proxy to cloud DFM service with local fallback"""
     
@@ -53,51 +86,17 @@ class CloudDFMProxy:
                 "client_version": "1.0.0"
             }
             
-            # Convert payload to JSON string
-            data = json.dumps(payload).encode('utf-8')
-            
-            # Try to check cloud health first
-            cloud_available = False
-            try:
-                cloud_url = f"{self.cloud_endpoint}/health"
-                logger.info(f"Checking cloud health at {cloud_url}")
-                
-                # Create request
-                headers = {'X-API-Key': self.api_key}
-                req = Request(cloud_url, headers=headers)
-                
-                # Send request with a short timeout
-                with urlopen(req, timeout=2) as response:
-                    # Read response
-                    response_data = response.read().decode('utf-8')
-                    cloud_data = json.loads(response_data)
-                    cloud_status = cloud_data.get('status', 'unknown')
-                    logger.info(f"Cloud status: {cloud_status}")
-                    cloud_available = (cloud_status == "healthy")
-            except Exception as e:
-                logger.warning(f"Cloud health check failed: {str(e)}")
-                cloud_available = False
-            
-            # Only try to call cloud if health check passed
-            if cloud_available:
-                try:
-                    # Call cloud service
-                    url = f"{self.cloud_endpoint}/api/v2/analyze"
-                    logger.info(f"Calling cloud DFM service at {url}")
-                    
-                    # Create request
-                    req = Request(url, data=data, headers=self.headers, method='POST')
-                    
-                    # Send request
-                    with urlopen(req, timeout=10) as response:
-                        # Read response
-                        response_data = response.read().decode('utf-8')
-                        cloud_result = json.loads(response_data)
-                        logger.info("Cloud DFM analysis successful")
-                        return cloud_result
-                except Exception as e:
-                    logger.error(f"Cloud DFM analysis request failed: {str(e)}")
-                    # Fall through to local fallback
+            # Serve a repeat analysis from the cache; the key leaves out the
+            # per-request timestamp. Concurrent requests for the same analysis
+            # share one cloud call.
+            cache_key = (self.cloud_endpoint, encode_json(
+                {"cad_data": geometry, "user_requirements": payload["user_requirements"]},
+                sort_keys=True, default=str
+            ))
+            cloud_result = dfm_cache.get_or_compute(cache_key, lambda: self._analyze_in_cloud(payload))
+            if cloud_result is not None:
+                # Handlers edit the result, so never hand out the cached dict itself
+                return dict(cloud_result)
             
             # If we get here, either cloud is unavailable or the request failed
             logger.info("Using local DFM engine as fallback")
@@ -108,6 +107,45 @@ class CloudDFMProxy:
             logger.info("Falling back to local DFM engine due to error")
             return self.fallback_engine.analyze(geometry, material, process, production_volume, advanced_analysis)
     
+    def _analyze_in_cloud(self, payload):
+        """Send payload to the cloud DFM service, returning None if it is unavailable or fails"""
+        # Try to check cloud health first
+        cloud_available = False
+        try:
+            cloud_url = f"{self.cloud_endpoint}/health"
+            logger.info(f"Checking cloud health at {cloud_url}")
+            
+            # Send request with a short timeout
+            headers = {'X-API-Key': self.api_key}
+            response = http_session.get(cloud_url, headers=headers, timeout=2)
+            response.raise_for_status()
+            cloud_data = decode_json(response.content)
+            cloud_status = cloud_data.get('status', 'unknown')
+            logger.info(f"Cloud status: {cloud_status}")
+            cloud_available = (cloud_status == "healthy")
+        except Exception as e:
+            logger.warning(f"Cloud health check failed: {str(e)}")
+            cloud_available = False
+        
+        # Only try to call cloud if health check passed
+        if not cloud_available:
+            return None
+        
+        try:
+            # Call cloud service
+            url = f"{self.cloud_endpoint}/api/v2/analyze"
+            logger.info(f"Calling cloud DFM service at {url}")
+            
+            # Send request
+            response = http_session.post(url, data=encode_json(payload), headers=self.headers, timeout=10)
+            response.raise_for_status()
+            cloud_result = decode_json(response.content)
+            logger.info("Cloud DFM analysis successful")
+            return cloud_result
+        except Exception as e:
+            logger.error(f"Cloud DFM analysis request failed: {str(e)}")
+            return None
+    
     def _get_timestamp(self):
         """Get current timestamp in ISO format"""
         try:
@@ -389,19 +427,15 @@ class DFMRequestHandler(BaseHTTPRequestHandler):
                 cloud_url = f"{cloud_config['endpoint']}/health"
                 logger.info(f"Checking cloud health at {cloud_url}")
                 
-                # Create request
-                headers = {'X-API-Key': cloud_config['api_key']}
-                req = Request(cloud_url, headers=headers)
-                
                 # Send request
-                with urlopen(req, timeout=5) as response:
-                    # Read response
-                    response_data = response.read().decode('utf-8')
-                    cloud_data = json.loads(response_data)
-                    cloud_status = cloud_data.get('status', 'unknown')
-                    logger.info(f"Cloud status: {cloud_status}")
-            except HTTPError as e:
-                logger.warning(f"Cloud health check failed with status {e.code}")
+                headers = {'X-API-Key': cloud_config['api_key']}
+                response = http_session.get(cloud_url, headers=headers, timeout=5)
+                response.raise_for_status()
+                cloud_data = decode_json(response.content)
+                cloud_status = cloud_data.get('status', 'unknown')
+                logger.info(f"Cloud status: {cloud_status}")
+            except requests.HTTPError as e:
+                logger.warning(f"Cloud health check failed with status {e.response.status_code}")
                 cloud_status = "unavailable"
             except Exception as e:
                 logger.error(f"Error checking cloud health: {str(e)}")
@@ -415,11 +449,11 @@ class DFMRequestHandler(BaseHTTPRequestHandler):
                 "cloud_status": cloud_status,
                 "mode": "proxy" if cloud_status == "healthy" else "fallback"
             }
-            self.wfile.write(json.dumps(response).encode())
+            self.wfile.write(encode_json(response))
         else:
             self._set_headers(404)
             response = {"status": "error", "message": "Not found"}
-            self.wfile.write(json.dumps(response).encode())
+            self.wfile.write(encode_json(response))
             
     def _get_timestamp(self):
         """Get current timestamp in ISO format"""
@@ -437,13 +471,13 @@ class DFMRequestHandler(BaseHTTPRequestHandler):
             if api_key != 'test-api-key':
                 self._set_headers(401)
                 response = {"status": "error", "message": "Invalid API key"}
-                self.wfile.write(json.dumps(response).encode())
+                self.wfile.write(encode_json(response))
                 return
             
             # Parse request data
             content_length = int(self.headers['Content-Length'])
             post_data = self.rfile.read(content_length)
-            request_data = json.loads(post_data.decode())
+            request_data = decode_json(post_data)
             
             # Extract requirements
             user_requirements = request_data.get("user_requirements", {})
@@ -525,23 +559,27 @@ class DFMRequestHandler(BaseHTTPRequestHandler):
                 logger.info(f"Sample issue: {issues[0] if issues else 'None'}")
                 
                 self._set_headers()
-                self.wfile.write(json.dumps(response_data).encode())
+                self.wfile.write(encode_json(response_data))
             
             except Exception as e:
                 logger.error(f"Error processing request: {str(e)}")
                 logger.error(traceback.format_exc())
                 self._set_headers(500)
                 response = {"status": "error", "message": f"Internal server error: {str(e)}"}
-                self.wfile.write(json.dumps(response).encode())
+                self.wfile.write(encode_json(response))
         else:
             self._set_headers(404)
             response = {"status": "error", "message": "Not found"}
-            self.wfile.write(json.dumps(response).encode())
+            self.wfile.write(encode_json(response))
 
 def run_server(port=8080):
-    """Run the HTTP server"""
+    """Run the HTTP server
+    
+    Each request is handled on its own thread, so one slow cloud call doesn't
+    hold up health checks or other analyses
+    """
     server_address = ('', port)
-    httpd = HTTPServer(server_address, DFMRequestHandler)
+    httpd = ThreadingHTTPServer(server_address, DFMRequestHandler)
     logger.info(f"Starting server on port {port}...")
     try:
         httpd.serve_forever()
@@ -297,10 +297,10 @@ class AssemblyGenerator:
     
     def create_bearing_component(self, bearing_type):
         """Create bearing for assembly"""
-        # Simplified bearing representation
-        bearing = Part.makeCylinder(11, 7)  # 608 bearing
-        inner = Part.makeCylinder(4, 7)
-        bearing = bearing.cut(inner)
+        # Simplified bearing representation (608 bearing): revolve the ring's
+        # rectangular cross-section instead of cutting one cylinder from another
+        profile = Part.makePolygon([Vector(4, 0, 0), Vector(11, 0, 0), Vector(11, 0, 7), Vector(4, 0, 7), Vector(4, 0, 0)])
+        bearing = Part.Face(profile).revolve(Vector(0, 0, 0), Vector(0, 0, 1), 360)
         
         bearing_obj = self.assembly_doc.addObject("Part::Feature", "Bearing")
         bearing_obj.Shape = bearing
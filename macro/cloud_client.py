@@ -68,6 +68,11 @@ class CloudApiClient:
         # Store fallback endpoints from config
         self.fallback_endpoints = cloud_config.get("fallback_endpoints", [])
         
+        # Request headers are the same for every call, so build them once
+        self.headers = {"Content-Type": "application/json"}
+        if self.api_key:
+            self.headers["X-API-Key"] = self.api_key
+        
         # Test connection on init
         self.test_connection()
     
@@ -324,10 +329,8 @@ class CloudApiClient:
         """Make a request to the cloud API"""
         url = f"{self.api_url}{endpoint}"
         
-        # Set up headers with API key if available
-        headers = {"Content-Type": "application/json"}
+        headers = self.headers
         if self.api_key:
-            headers["X-API-Key"] = self.api_key
             print("Using API key for authentication")
         
         try:
@@ -360,6 +363,9 @@ class CloudApiClient:
                     print(f"Response content: {e.response.text}")
                 except:
                     pass
+            if isinstance(e, requests.exceptions.HTTPError):
+                # Keep the response attached so callers can branch on the status code
+                raise requests.exceptions.HTTPError(f"Cloud API request failed: {str(e)}", response=e.response)
             raise Exception(f"Cloud API request failed: {str(e)}")
         
         except Exception as e:
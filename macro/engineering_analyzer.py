@@ -49,9 +49,12 @@ def run_full_analysis(document, selected_objects=None):
         y_length = min(overall_bbox.YLength, max_reasonable_size) if overall_bbox.YLength > 0 else 0
         z_length = min(overall_bbox.ZLength, max_reasonable_size) if overall_bbox.ZLength > 0 else 0
         
-        # Use shape's actual volume and surface area, but cap at reasonable values
-        volume = min(main_shape.Volume, max_reasonable_size**3) if main_shape.Volume > 0 else 0
-        surface_area = min(main_shape.Area, max_reasonable_size**2) if main_shape.Area > 0 else 0
+        # Use shape's actual volume and surface area, but cap at reasonable values;
+        # each property access recomputes it, so read them once
+        shape_volume = main_shape.Volume
+        shape_area = main_shape.Area
+        volume = min(shape_volume, max_reasonable_size**3) if shape_volume > 0 else 0
+        surface_area = min(shape_area, max_reasonable_size**2) if shape_area > 0 else 0
         
         dimensions = {
             "length_x": x_length,
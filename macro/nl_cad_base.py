@@ -10,6 +10,16 @@ import Part
 from cloud_ai_processor import CloudAIProcessor
 from context_manager import DesignContextManager
 
+# Phrases that mark a command as needing AI processing; matched anywhere in the
+# text, case-insensitively, by one precompiled pattern
+COMPLEX_INDICATORS = (
+    'assembly', 'mechanism', 'system',
+    'for my', 'that fits', 'compatible with',
+    'optimized', 'analyze', 'suggest',
+    'with', 'including', 'having'
+)
+COMPLEX_INDICATOR_PATTERN = re.compile('|'.join(map(re.escape, COMPLEX_INDICATORS)), re.IGNORECASE)
+
 class NaturalLanguageCADEditor:
     """Natural Language CAD Editor"""
     
@@ -630,15 +640,7 @@ class NaturalLanguageCADEditor:
         
     def is_complex_command(self, text):
         """Determine if command needs AI processing"""
-        complex_indicators = [
-            'assembly', 'mechanism', 'system',
-            'for my', 'that fits', 'compatible with',
-            'optimized', 'analyze', 'suggest',
-            'with', 'including', 'having'
-        ]
-        
-        text_lower = text.lower()
-        return any(indicator in text_lower for indicator in complex_indicators)
+        return COMPLEX_INDICATOR_PATTERN.search(text) is not None
     
     def set_cloud_client(self, cloud_client):
         """Set cloud client for AI processing"""
@@ -6,7 +6,6 @@ that might cause "shape is invalid" errors.
 
 import math
 import re
-import time
 
 # Try to import FreeCAD modules, but allow the module to be imported for inspection
 # even when FreeCAD is not available
@@ -132,31 +131,27 @@ def create_simple_gearbox(ratio, motor_type="NEMA17"):
         tooth_height = 5.0  # Taller teeth for better visibility
         tooth_width_angle = 360.0 / (input_teeth * 3)  # Width of tooth in degrees (adjusted for better appearance)
         
+        # Tooth dimensions are the same for every tooth on the gear
+        base_radius = input_diameter/2 - tooth_height
+        tooth_width = 2 * math.pi * (input_diameter/2) * tooth_width_angle / 360.0
+        tooth_pitch = 360.0 / input_teeth  # Angle between teeth in degrees
+        
         # Create base cylinder for input gear
-        input_gear_base = Part.makeCylinder(input_diameter/2 - tooth_height, gear_thickness)
+        input_gear_base = Part.makeCylinder(base_radius, gear_thickness)
+        
+        # Build one tooth at the rim (a box, simpler than a wedge to avoid parameter
+        # issues), then place rotated copies of it around the gear
+        tooth_template = Part.makeBox(tooth_height*1.5, tooth_width, gear_thickness)
+        tooth_template.translate(Base.Vector(base_radius, -tooth_width/2, 0))
         
-        # Create teeth for input gear - improved shape
-        input_gear_with_teeth = input_gear_base
+        input_teeth_shapes = []
         for i in range(input_teeth):
-            # Calculate tooth position
-            angle = i * 360.0 / input_teeth  # Angle in degrees
-            
-            # Create tooth as a trapezoid (wider at base, narrower at tip) for better gear teeth appearance
-            tooth_width = 2 * math.pi * (input_diameter/2) * tooth_width_angle / 360.0
-            
-            # Create points for a trapezoid shape
-            base_radius = input_diameter/2 - tooth_height
-            tip_radius = input_diameter/2 + tooth_height/2  # Slightly extended for better meshing
-            
-            # Create a box shape for each tooth (simpler than wedge to avoid parameter issues)
-            tooth = Part.makeBox(tooth_height*1.5, tooth_width, gear_thickness)
-            
-            # Position and rotate tooth
-            tooth.translate(Base.Vector(base_radius, -tooth_width/2, 0))
-            tooth.rotate(Base.Vector(0, 0, 0), Base.Vector(0, 0, 1), angle)
-            
-            # Add tooth to gear
-            input_gear_with_teeth = input_gear_with_teeth.fuse(tooth)
+            tooth = tooth_template.copy()
+            tooth.rotate(Base.Vector(0, 0, 0), Base.Vector(0, 0, 1), i * tooth_pitch)
+            input_teeth_shapes.append(tooth)
+        
+        # Fuse all teeth onto the base in one boolean operation
+        input_gear_with_teeth = input_gear_base.fuse(input_teeth_shapes)
         
         # Position the gear
         input_gear_with_teeth.translate(Base.Vector(0, 0, housing_height + 15))
@@ -171,31 +166,27 @@ def create_simple_gearbox(ratio, motor_type="NEMA17"):
         # Create output gear with improved teeth - matching input gear style
         tooth_width_angle = 360.0 / (output_teeth * 3)  # Width of tooth in degrees (adjusted for better appearance)
         
+        # Tooth dimensions are the same for every tooth on the gear
+        base_radius = output_diameter/2 - tooth_height
+        tooth_width = 2 * math.pi * (output_diameter/2) * tooth_width_angle / 360.0
+        tooth_pitch = 360.0 / output_teeth  # Angle between teeth in degrees
+        
         # Create base cylinder for output gear
-        output_gear_base = Part.makeCylinder(output_diameter/2 - tooth_height, gear_thickness)
+        output_gear_base = Part.makeCylinder(base_radius, gear_thickness)
         
-        # Create teeth for output gear - improved shape
-        output_gear_with_teeth = output_gear_base
+        # Build one tooth at the rim (a box, simpler than a wedge to avoid parameter
+        # issues), then place rotated copies of it around the gear
+        tooth_template = Part.makeBox(tooth_height*1.5, tooth_width, gear_thickness)
+        tooth_template.translate(Base.Vector(base_radius, -tooth_width/2, 0))
+        
+        output_teeth_shapes = []
         for i in range(output_teeth):
-            # Calculate tooth position
-            angle = i * 360.0 / output_teeth  # Angle in degrees
-            
-            # Create tooth as a trapezoid (wider at base, narrower at tip) for better gear teeth appearance
-            tooth_width = 2 * math.pi * (output_diameter/2) * tooth_width_angle / 360.0
-            
-            # Create points for a trapezoid shape
-            base_radius = output_diameter/2 - tooth_height
-            tip_radius = output_diameter/2 + tooth_height/2  # Slightly extended for better meshing
-            
-            # Create a box shape for each tooth (simpler than wedge to avoid parameter issues)
-            tooth = Part.makeBox(tooth_height*1.5, tooth_width, gear_thickness)
-            
-            # Position and rotate tooth
-            tooth.translate(Base.Vector(base_radius, -tooth_width/2, 0))
-            tooth.rotate(Base.Vector(0, 0, 0), Base.Vector(0, 0, 1), angle)
-            
-            # Add tooth to gear
-            output_gear_with_teeth = output_gear_with_teeth.fuse(tooth)
+            tooth = tooth_template.copy()
+            tooth.rotate(Base.Vector(0, 0, 0), Base.Vector(0, 0, 1), i * tooth_pitch)
+            output_teeth_shapes.append(tooth)
+        
+        # Fuse all teeth onto the base in one boolean operation
+        output_gear_with_teeth = output_gear_base.fuse(output_teeth_shapes)
         
         # Position the gear - ensure proper alignment with input gear for meshing
         # Calculate rotation to mesh gears properly
@@ -420,10 +411,6 @@ def create_simple_gearbox(ratio, motor_type="NEMA17"):
                 print("Debug: Fitting view to show all objects")
                 FreeCADGui.SendMsgToActiveView("ViewFit")
                 FreeCADGui.updateGui()
-                
-                # Force another update after a short delay
-                time.sleep(0.5)
-                FreeCADGui.updateGui()
             except Exception as e:
                 print(f"Error setting view orientation: {str(e)}")
             
@@ -7,6 +7,9 @@ import Part
 import math
 import json
 
+# Shape names that route a description to the generic shape builder
+BASIC_SHAPES = ("sphere", "cylinder", "cone", "box", "cube", "torus")
+
 class SketchToCADProcessor:
     """Process sketch descriptions and create CAD models"""
     
@@ -17,12 +20,14 @@ class SketchToCADProcessor:
     def process_sketch_description(self, description):
         """Process a sketch description and create a CAD model"""
         try:
+            desc_lower = description.lower()
+            
             # Check if description contains plate with holes
-            if "plate" in description.lower() and "hole" in description.lower():
+            if "plate" in desc_lower and "hole" in desc_lower:
                 return self.create_plate_from_sketch(description)
             
             # Check for basic shapes
-            if any(shape in description.lower() for shape in ["sphere", "cylinder", "cone", "box", "cube", "torus"]):
+            if any(shape in desc_lower for shape in BASIC_SHAPES):
                 return self.create_generic_from_sketch(description)
                 
             # Default to generic shape
@@ -223,11 +228,24 @@ class SketchToCADProcessor:
                     inner_match = re.search(r'inner[:\s]*(\d+(?:\.\d+)?)', description, re.IGNORECASE)
                     if inner_match:
                         inner_radius = float(inner_match.group(1)) / 2
-                    
-                    outer = Part.makeCylinder(radius, height)
-                    inner = Part.makeCylinder(inner_radius, height + 1)  # Slightly taller
-                    inner.translate(FreeCAD.Vector(0, 0, -0.5))  # Shift down slightly
-                    shape = outer.cut(inner)
+
+                    # The profile below would otherwise silently become a ring outside
+                    # the outer radius, or a degenerate face
+                    if not 0 < inner_radius < radius:
+                        return {
+                            'success': False,
+                            'message': f'Error creating shape: inner diameter {inner_radius*2}mm must be '
+                                       f'greater than 0 and less than the outer diameter {radius*2}mm'
+                        }
+
+                    # Revolve the wall's cross-section to get the tube in one step
+                    # instead of cutting an inner cylinder out of an outer one
+                    profile = Part.makePolygon([
+                        FreeCAD.Vector(inner_radius, 0, 0), FreeCAD.Vector(radius, 0, 0),
+                        FreeCAD.Vector(radius, 0, height), FreeCAD.Vector(inner_radius, 0, height),
+                        FreeCAD.Vector(inner_radius, 0, 0)
+                    ])
+                    shape = Part.Face(profile).revolve(FreeCAD.Vector(0, 0, 0), FreeCAD.Vector(0, 0, 1), 360)
                     shape_obj = doc.addObject("Part::Feature", "Tube")
                     msg = f'Created tube with outer diameter {radius*2}mm, inner diameter {inner_radius*2}mm, height {height}mm'
                 else:
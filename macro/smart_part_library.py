@@ -165,18 +165,20 @@ class SmartPartLibrary:
     
     def create_bearing_cad(self, data):
         """Create bearing CAD"""
+        import FreeCAD
         import Part
         
         specs = data['specs']
         
-        # Outer ring
-        outer = Part.makeCylinder(specs['od']/2, specs['width'])
-        
-        # Inner ring
-        inner = Part.makeCylinder(specs['id']/2, specs['width'])
-        
-        # Create bearing shape
-        bearing = outer.cut(inner)
+        # Create bearing shape by revolving the ring's rectangular cross-section,
+        # which avoids building two cylinders and cutting one from the other
+        r_out, r_in, width = specs['od']/2, specs['id']/2, specs['width']
+        profile = Part.makePolygon([
+            FreeCAD.Vector(r_in, 0, 0), FreeCAD.Vector(r_out, 0, 0),
+            FreeCAD.Vector(r_out, 0, width), FreeCAD.Vector(r_in, 0, width),
+            FreeCAD.Vector(r_in, 0, 0)
+        ])
+        bearing = Part.Face(profile).revolve(FreeCAD.Vector(0, 0, 0), FreeCAD.Vector(0, 0, 1), 360)
         
         # Add groove representation
         groove_r = (specs['od'] + specs['id']) / 4
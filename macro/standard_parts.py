@@ -50,34 +50,23 @@ class StandardParts:
             tooth_angle = 360.0 / teeth  # Angle between teeth
             tooth_width_angle = tooth_angle * 0.4  # Width of each tooth in degrees
             
-            # Create a compound shape to hold all teeth
-            all_teeth = []
+            # Every tooth has the same size, so build one box at the edge of the
+            # root cylinder and rotate copies of it into place
+            tooth_height = (outer_diameter - root_diameter) / 2  # Radial height of tooth
+            tooth_width = root_diameter * math.sin(math.radians(tooth_width_angle))  # Arc width at root diameter
+            tooth_template = Part.makeBox(tooth_height, tooth_width, width)
+            tooth_template.translate(FreeCAD.Vector(root_diameter/2, -tooth_width/2, 0))
             
+            all_teeth = []
             for i in range(teeth):
-                # Calculate the angle for this tooth
-                angle = i * tooth_angle
-                
-                # Create a tooth as a box
-                tooth_height = (outer_diameter - root_diameter) / 2  # Radial height of tooth
-                tooth_width = root_diameter * math.sin(math.radians(tooth_width_angle))  # Arc width at root diameter
-                
-                # Create the tooth as a box
-                tooth = Part.makeBox(tooth_height, tooth_width, width)
-                
-                # Position the tooth at the edge of the root cylinder
-                tooth.translate(FreeCAD.Vector(root_diameter/2, -tooth_width/2, 0))
-                
-                # Rotate the tooth to its position
-                tooth.rotate(FreeCAD.Vector(0, 0, 0), FreeCAD.Vector(0, 0, 1), angle)
-                
-                # Add to our collection
+                tooth = tooth_template.copy()
+                tooth.rotate(FreeCAD.Vector(0, 0, 0), FreeCAD.Vector(0, 0, 1), i * tooth_angle)
                 all_teeth.append(tooth)
             
-            # Fuse all teeth with the base cylinder
+            # Fuse all teeth with the base cylinder in a single boolean operation;
+            # chaining one fuse per tooth re-intersects the growing shape every time
             print("Debug: Fusing teeth with base cylinder")
-            gear_shape = base_cylinder
-            for tooth in all_teeth:
-                gear_shape = gear_shape.fuse(tooth)
+            gear_shape = base_cylinder.fuse(all_teeth)
             
             # Create center bore if specified
             if bore > 0:
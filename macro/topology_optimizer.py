@@ -103,9 +103,9 @@ class TopologyOptimizer:
                     hex_cut = hex_hole.extrude(FreeCAD.Vector(0, 0, bbox.ZLength))
                     holes.append(hex_cut)
         
-        # Cut all holes
-        for hole in holes:
-            optimized = optimized.cut(hole)
+        # Cut all holes in one boolean operation rather than one cut per hole
+        if holes:
+            optimized = optimized.cut(holes)
         
         # Create result object
         opt_obj = doc.addObject("Part::Feature", "Optimized_Plate")
@@ -201,9 +201,10 @@ class TopologyOptimizer:
                         sphere.translate(point)
                         cuts.append(sphere)
         
-        # Apply cuts
-        for cut in cuts[:int(len(cuts) * target_reduction)]:
-            optimized = optimized.cut(cut)
+        # Apply cuts in one boolean operation rather than one cut per sphere
+        selected_cuts = cuts[:int(len(cuts) * target_reduction)]
+        if selected_cuts:
+            optimized = optimized.cut(selected_cuts)
         
         # Create result
         opt_obj = doc.addObject("Part::Feature", "Optimized_Lattice")
@@ -12,7 +12,8 @@ from pathlib import Path
 # Add macro directory to path
 SCRIPT_DIR = Path(__file__).parent
 MACRO_DIR = SCRIPT_DIR / "macro"
-sys.path.append(str(MACRO_DIR))
+if str(MACRO_DIR) not in sys.path:
+    sys.path.insert(0, str(MACRO_DIR))
 
 # Import required modules
 import cloud_client
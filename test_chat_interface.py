@@ -7,7 +7,9 @@ import sys
 import os
 
 # Add the parent directory to the path so we can import the macro modules
-sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
+if SCRIPT_DIR not in sys.path:
+    sys.path.insert(0, SCRIPT_DIR)
 
 try:
     print("Attempting to import chat_interface module...")
@@ -8,8 +8,9 @@ Run this script from within FreeCAD to test the cloud analyzer functionality
 
 import os
 import sys
-import time
 import json
+import unittest
+from unittest.mock import patch
 
 # Add the project directory to the Python path
 script_dir = os.path.dirname(os.path.realpath(__file__))
@@ -21,6 +22,10 @@ try:
     import FreeCAD
     import Part
 except ImportError:
+    # Under a test runner skip this module instead of exiting, so the rest of
+    # the suite (and any parallel workers) keep running
+    if __name__ != "__main__":
+        raise unittest.SkipTest("FreeCAD is not available")
     print("Error: Cannot import FreeCAD modules. This script must be run from within FreeCAD.")
     sys.exit(1)
 
@@ -35,6 +40,8 @@ except ImportError as e:
     print("Make sure all required files are in the correct directories.")
     sys.exit(1)
 
+from test_utils import timed
+
 def create_test_document():
     """Create a test document with some basic shapes for testing"""
     doc = FreeCAD.newDocument("TestModel")
@@ -144,11 +151,9 @@ def test_force_local_fallback():
         doc = FreeCAD.ActiveDocument
         print(f"Using active document: {doc.Name}")
     
-    # Temporarily modify the cloud URL to force a connection error
-    original_url = config.CLOUD_API_URL
-    config.CLOUD_API_URL = "https://nonexistent-service-url.example.com"
-    
-    try:
+    # Temporarily modify the cloud URL to force a connection error; patch.object
+    # restores the original URL however the block exits
+    with patch.object(config, "CLOUD_API_URL", "https://nonexistent-service-url.example.com"):
         # Initialize a new cloud client with the bad URL
         client = cloud_client.CloudApiClient(config.CLOUD_API_URL, config.CLOUD_API_KEY)
         
@@ -157,11 +162,9 @@ def test_force_local_fallback():
         analyzer.cloud_client = client
         
         print("Testing with invalid cloud URL to force fallback...")
-        start_time = time.time()
-        result = analyzer.analyze_document(doc)
-        end_time = time.time()
+        with timed("Analysis completed"):
+            result = analyzer.analyze_document(doc)
         
-        print(f"Analysis completed in {end_time - start_time:.2f} seconds")
         print(f"Analysis type: {result.get('analysis_type', 'unknown')}")
         
         if result.get('analysis_type') == 'local':
@@ -172,10 +175,6 @@ def test_force_local_fallback():
         else:
             print("❌ Failed to fall back to local analysis")
             return False
-            
-    finally:
-        # Restore the original URL
-        config.CLOUD_API_URL = original_url
 
 def main():
     """Main function to run all tests"""
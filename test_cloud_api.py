@@ -13,7 +13,8 @@ from datetime import datetime
 
 # Add macro directory to path
 MACRO_DIR = os.path.dirname(os.path.realpath(__file__))
-sys.path.append(MACRO_DIR)
+if MACRO_DIR not in sys.path:
+    sys.path.insert(0, MACRO_DIR)
 
 # Import cloud client
 try:
@@ -21,6 +22,8 @@ try:
 except ImportError:
     import cloud_client, config
 
+from test_utils import dumps_json
+
 # List of possible endpoints to test
 POSSIBLE_ENDPOINTS = [
     "/",                     # Root endpoint
@@ -63,7 +66,9 @@ def test_endpoint(endpoint, method="GET", payload=None, api_key=None):
             response = requests.head(url, headers=headers, timeout=5)
         elif method == "POST":
             if payload:
-                print(f"With payload: {json.dumps(payload, indent=2)[:200]}..." if len(json.dumps(payload)) > 200 else json.dumps(payload, indent=2))
+                # Serialize once and reuse the string for the length check and the preview
+                payload_str = dumps_json(payload, indent=True)
+                print(f"With payload: {payload_str[:200] + '...' if len(payload_str) > 200 else payload_str}")
             response = requests.post(url, json=payload, headers=headers, timeout=15)
         else:
             return {"status": 0, "exists": False, "error": f"Unsupported method: {method}"}
@@ -82,7 +87,8 @@ def test_endpoint(endpoint, method="GET", payload=None, api_key=None):
             if response.text:
                 json_response = response.json()
                 result["response"] = json_response
-                print(f"Response content: {json.dumps(json_response, indent=2)[:300]}..." if len(json.dumps(json_response)) > 300 else json.dumps(json_response, indent=2))
+                response_str = dumps_json(json_response, indent=True)
+                print(f"Response content: {response_str[:300] + '...' if len(response_str) > 300 else response_str}")
         except json.JSONDecodeError:
             result["response"] = response.text[:200] + "..." if len(response.text) > 200 else response.text
             print(f"Response content (not JSON): {result['response']}")
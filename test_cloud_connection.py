@@ -5,17 +5,19 @@ Test script to verify connection to the FreeCAD Manufacturing Co-Pilot Cloud Ser
 
 import sys
 import os
-import json
 
 # Add the macro directory to the path so we can import modules
 script_dir = os.path.dirname(os.path.abspath(__file__))
 macro_dir = os.path.join(script_dir, "macro")
-sys.path.append(macro_dir)
+if macro_dir not in sys.path:
+    sys.path.insert(0, macro_dir)
 
 # Import the cloud client
 import cloud_client
 import config
 
+from test_utils import dumps_json
+
 def main():
     print(f"Testing connection to cloud service at: {config.CLOUD_API_URL}")
     
@@ -32,7 +34,7 @@ def main():
     try:
         print("\nTesting /health endpoint...")
         response = client._make_request("/health", method="GET")
-        print(f"Health check response: {json.dumps(response, indent=2)}")
+        print(f"Health check response: {dumps_json(response, indent=True)}")
     except Exception as e:
         print(f"Health check error: {e}")
     
@@ -40,7 +42,7 @@ def main():
     try:
         print("\nTesting /agents endpoint...")
         response = client.get_available_agents()
-        print(f"Available agents: {json.dumps(response, indent=2)}")
+        print(f"Available agents: {dumps_json(response, indent=True)}")
     except Exception as e:
         print(f"Agents error: {e}")
     
@@ -50,7 +52,7 @@ def main():
         agent_id = "machining-expert"  # Use one of the available agent IDs
         query = "How do I optimize a milling operation?"
         response = client.query_agent(agent_id, query, {})
-        print(f"Query response: {json.dumps(response, indent=2)}")
+        print(f"Query response: {dumps_json(response, indent=True)}")
     except Exception as e:
         print(f"Query error: {e}")
 
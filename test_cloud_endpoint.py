@@ -5,12 +5,13 @@ Test script to verify cloud endpoints are working correctly
 
 import sys
 import os
-import json
 import time
 import requests
 
 # Add the current directory to the path so we can import our modules
-sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
+if SCRIPT_DIR not in sys.path:
+    sys.path.insert(0, SCRIPT_DIR)
 
 try:
     # Try to import from the macro package
@@ -20,6 +21,11 @@ except ImportError:
     import cloud_client
     import config
 
+from test_utils import dumps_json
+
+# Shared by every probe and the results file so one run carries one timestamp
+RUN_TIMESTAMP = time.strftime("%Y-%m-%dT%H:%M:%S")
+
 def test_cloud_connection():
     """Test the connection to the cloud service"""
     print("\n=== Testing Cloud Connection ===")
@@ -39,15 +45,19 @@ def test_health_endpoint(client):
     print("\n=== Testing Health Endpoint ===")
     try:
         response = client._make_request("/health", method="GET")
-        print(f"Health endpoint response: {json.dumps(response, indent=2)}")
+        print(f"Health endpoint response: {dumps_json(response, indent=True)}")
         print("✅ Health endpoint is working")
         return True
     except Exception as e:
         print(f"❌ Health endpoint failed: {str(e)}")
         return False
 
-def test_analysis_endpoints(client):
-    """Test all possible analysis endpoints"""
+def test_analysis_endpoints(client, record_result=None):
+    """Test all possible analysis endpoints
+    
+    record_result, if given, is called with (endpoint, status) as soon as each
+    endpoint has been probed
+    """
     print("\n=== Testing Analysis Endpoints ===")
     
     # Create a minimal test payload - wrap in cad_data as expected by the API
@@ -68,7 +78,7 @@ def test_analysis_endpoints(client):
                     "fillets": 4
                 }
             },
-            "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S")
+            "timestamp": RUN_TIMESTAMP
         }
     }
     
@@ -92,21 +102,31 @@ def test_analysis_endpoints(client):
             try:
                 client._make_request(endpoint, method="HEAD")
                 print(f"✅ Endpoint exists: {endpoint}")
-            except Exception as e:
-                if "404" in str(e):
+            except requests.exceptions.HTTPError as e:
+                if e.response is not None and e.response.status_code == 404:
                     print(f"❌ Endpoint not found: {endpoint}")
+                    if record_result:
+                        record_result(endpoint, "not_found")
                     continue
+            except Exception:
+                pass
             
             # Try a POST request with test payload
             try:
                 response = client._make_request(endpoint, payload=test_payload)
                 print(f"✅ Successfully called endpoint: {endpoint}")
-                print(f"Response: {json.dumps(response, indent=2)}")
+                print(f"Response: {dumps_json(response, indent=True)}")
                 working_endpoints.append(endpoint)
+                if record_result:
+                    record_result(endpoint, "working")
             except Exception as e:
                 print(f"❌ POST request failed: {str(e)}")
+                if record_result:
+                    record_result(endpoint, "failed")
         except Exception as e:
             print(f"❌ Error testing endpoint {endpoint}: {str(e)}")
+            if record_result:
+                record_result(endpoint, "error")
     
     if working_endpoints:
         print(f"\n✅ Found {len(working_endpoints)} working endpoints: {', '.join(working_endpoints)}")
@@ -133,12 +153,20 @@ def main():
     if not health_ok:
         print("⚠️ Health endpoint failed, but continuing with analysis endpoint tests.")
     
-    # Test analysis endpoints
-    working_endpoints = test_analysis_endpoints(client)
+    # Test analysis endpoints, appending each probe to a JSONL log as it completes
+    # so a crash mid-sweep still leaves the partial results on disk
+    with open("cloud_endpoint_test_results.jsonl", "w") as probe_log:
+        def record_result(endpoint, status):
+            probe_log.write(dumps_json({"endpoint": endpoint, "status": status, "ts": time.time()}) + "\n")
+            probe_log.flush()
+        
+        working_endpoints = test_analysis_endpoints(client, record_result)
+    
+    print("Per-endpoint probe log saved to cloud_endpoint_test_results.jsonl")
     
     # Save results to file
     results = {
-        "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "timestamp": RUN_TIMESTAMP,
         "cloud_url": client.api_url,
         "connected": client.connected,
         "health_endpoint_working": health_ok,
@@ -146,7 +174,7 @@ def main():
     }
     
     with open("cloud_endpoint_test_results.json", "w") as f:
-        json.dump(results, f, indent=2)
+        f.write(dumps_json(results, indent=True))
     
     print("\nTest results saved to cloud_endpoint_test_results.json")
     
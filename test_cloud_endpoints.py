@@ -1,7 +1,6 @@
 #!/usr/bin/env python3
 """Test script to discover working endpoints on the Google Cloud Run service"""
 
-import requests
 import json
 import time
 import sys
@@ -11,7 +10,8 @@ from datetime import datetime
 
 # Add macro directory to path
 MACRO_DIR = os.path.dirname(os.path.realpath(__file__))
-sys.path.append(MACRO_DIR)
+if MACRO_DIR not in sys.path:
+    sys.path.insert(0, MACRO_DIR)
 
 # Import cloud client
 try:
@@ -19,8 +19,10 @@ try:
 except ImportError:
     import cloud_client, config
 
+from test_utils import HEADERS, PROBE_TIMEOUT, decode_json, dumps_json, make_session
+
 # List of possible endpoints to test
-POSSIBLE_ENDPOINTS = [
+POSSIBLE_ENDPOINTS = (
     "/",                     # Root endpoint
     "/health",               # Health check endpoint
     "/api",                  # API root
@@ -35,34 +37,35 @@ POSSIBLE_ENDPOINTS = [
     "/api/agents",           # Agents endpoint
     "/docs",                 # API documentation
     "/openapi.json"          # OpenAPI schema
-]
+)
+
+# Shared session so the sweep reuses one connection and one set of default headers
+SESSION = make_session(HEADERS)
+
+# Full URLs for the sweep, index-aligned with POSSIBLE_ENDPOINTS
+URLS = tuple(config.CLOUD_API_URL + endpoint for endpoint in POSSIBLE_ENDPOINTS)
 
-def test_endpoint(endpoint, method="GET", payload=None, api_key=None):
+def test_endpoint(url, method="GET", payload=None, api_key=None):
     """Test if an endpoint exists on the cloud service"""
-    url = f"{config.CLOUD_API_URL}{endpoint}"
-    
     print(f"\nTesting endpoint: {url}")
     print(f"Method: {method}")
     
-    headers = {
-        'Content-Type': 'application/json',
-        'Accept': 'application/json'
-    }
-    
-    # Add API key if provided
+    # Only the optional API key varies per call; the session supplies the rest
+    headers = None
     if api_key:
-        headers['X-API-Key'] = api_key
+        headers = {'X-API-Key': api_key}
         print("Using API key")
     
     try:
         if method == "GET":
-            response = requests.get(url, headers=headers, timeout=10)
+            response = SESSION.get(url, headers=headers, timeout=PROBE_TIMEOUT)
         elif method == "HEAD":
-            response = requests.head(url, headers=headers, timeout=5)
+            response = SESSION.head(url, headers=headers, timeout=PROBE_TIMEOUT)
         elif method == "POST":
             if payload:
-                print(f"With payload: {json.dumps(payload, indent=2)[:200]}..." if len(json.dumps(payload)) > 200 else json.dumps(payload, indent=2))
-            response = requests.post(url, json=payload, headers=headers, timeout=15)
+                payload_str = dumps_json(payload, indent=True)
+                print(f"With payload: {payload_str[:200] + '...' if len(payload_str) > 200 else payload_str}")
+            response = SESSION.post(url, json=payload, headers=headers, timeout=PROBE_TIMEOUT)
         else:
             return {"status": 0, "exists": False, "error": f"Unsupported method: {method}"}
         
@@ -77,33 +80,33 @@ def test_endpoint(endpoint, method="GET", payload=None, api_key=None):
         
         # Try to parse response as JSON
         try:
-            if response.text:
-                json_response = response.json()
+            if response.content:
+                json_response = decode_json(response.content)
                 result["response"] = json_response
-                print(f"Response content: {json.dumps(json_response, indent=2)[:300]}..." if len(json.dumps(json_response)) > 300 else json.dumps(json_response, indent=2))
+                response_str = dumps_json(json_response, indent=True)
+                print(f"Response content: {response_str[:300] + '...' if len(response_str) > 300 else response_str}")
         except json.JSONDecodeError:
-            result["response"] = response.text[:200] + "..." if len(response.text) > 200 else response.text
+            # Decode only the bytes being previewed rather than the whole body
+            preview = response.content[:200].decode('utf-8', 'replace')
+            result["response"] = preview + "..." if len(response.content) > 200 else preview
             print(f"Response content (not JSON): {result['response']}")
-                print("Endpoint not found (404)")
-            
-            try:
-                error_data = e.read().decode('utf-8')
-                print(f"Error response: {error_data}")
-            except:
-                pass
-                
-            return False
+        
+        if response.status_code == 404:
+            print("Endpoint not found (404)")
+        
+        return result
     
     except Exception as e:
         print(f"Error testing endpoint: {e}")
-        return False
+        return {"status": 0, "exists": False, "method": method, "url": url, "error": str(e)}
 
 def main():
     """Main function"""
-    print(f"Testing cloud service at: {config.CLOUD_API_URL}")
+    base_url = config.CLOUD_API_URL
+    print(f"Testing cloud service at: {base_url}")
     
     # Test health endpoint
-    test_endpoint("/health")
+    test_endpoint(base_url + "/health")
     
     # Test analysis endpoint with minimal payload
     minimal_payload = {
@@ -111,17 +114,23 @@ def main():
         "geometry": {"faces": [], "edges": []},
         "timestamp": "2023-07-12T12:00:00"
     }
-    test_endpoint("/api/analysis", method="POST", payload=minimal_payload)
+    test_endpoint(base_url + "/api/analysis", method="POST", payload=minimal_payload)
     
     # Test analysis endpoint without /api prefix
-    test_endpoint("/analysis", method="POST", payload=minimal_payload)
+    test_endpoint(base_url + "/analysis", method="POST", payload=minimal_payload)
     
     # Test the old endpoint to confirm it doesn't exist
-    test_endpoint("/api/cad-analysis", method="POST", payload=minimal_payload)
+    test_endpoint(base_url + "/api/cad-analysis", method="POST", payload=minimal_payload)
     
     # Test other endpoints
-    test_endpoint("/api/chat", method="POST", payload={"query": "What is manufacturing?"})
-    test_endpoint("/agents")
+    test_endpoint(base_url + "/api/chat", method="POST", payload={"query": "What is manufacturing?"})
+    test_endpoint(base_url + "/agents")
+    
+    # Sweep the known candidate endpoints
+    print("\n=== Endpoint sweep ===")
+    found = [endpoint for endpoint, url in zip(POSSIBLE_ENDPOINTS, URLS)
+             if test_endpoint(url).get("exists")]
+    print(f"\nEndpoints found: {', '.join(found) if found else 'none'}")
 
 if __name__ == "__main__":
     main()
@@ -7,57 +7,14 @@ import os
 import sys
 import io
 import contextlib
-from unittest.mock import patch, MagicMock
+from unittest.mock import patch
 
 # Add the macro directory to the path
 macro_dir = os.path.join(os.path.dirname(os.path.abspath(__file__)), "macro")
-sys.path.append(macro_dir)
+if macro_dir not in sys.path:
+    sys.path.insert(0, macro_dir)
 
-# Create mock modules for dependencies that might be missing
-class MockModule:
-    def __init__(self, name):
-        self.__name__ = name
-        
-    def __getattr__(self, name):
-        return lambda *args, **kwargs: None
-
-# Mock FreeCAD and related modules if not available
-for module_name in ['FreeCAD', 'Part', 'Mesh', 'MeshPart']:
-    if module_name not in sys.modules:
-        sys.modules[module_name] = MockModule(module_name)
-
-# Create a proper mock for requests with exceptions
-class RequestException(Exception):
-    pass
-
-class MockResponse:
-    def __init__(self, status_code, json_data=None, text=""):
-        self.status_code = status_code
-        self._json_data = json_data or {}
-        self.text = text
-        self.headers = {}
-        
-    def json(self):
-        return self._json_data
-        
-    def raise_for_status(self):
-        if self.status_code >= 400:
-            raise RequestException(f"{self.status_code} Client Error: Not Found")
-
-# Create a mock requests module
-mock_requests = type('MockRequests', (), {
-    'get': lambda url, **kwargs: MockResponse(200, {"status": "ok"}, "OK") if "/health" in url else MockResponse(404, {"error": "Not Found"}, "Not Found"),
-    'post': lambda url, **kwargs: MockResponse(404, {"error": "Not Found"}, "Not Found"),
-    'exceptions': type('Exceptions', (), {'RequestException': RequestException})
-})
-
-# Replace the requests module with our mock
-sys.modules['requests'] = mock_requests
-
-# Now import our modules
-from cloud_client import CloudApiClient
-from cloud_cad_analyzer import CloudCADAnalyzer, get_analyzer
-from local_cad_analyzer import LocalCADAnalyzer
+from test_utils import MockDocument, freecad_module_mocks, mock_cloud_get, mock_cloud_post
 
 def capture_output(func, *args, **kwargs):
     """Capture stdout during function execution"""
@@ -81,35 +38,29 @@ def test_cloud_fallback():
         "manufacturing_insights": {"difficulty": "medium"}
     }
     
-    # Create a mock document
-    class MockDocument:
-        def __init__(self, name):
-            self.Name = name
-            self.Objects = []
-            
-        def getBoundBox(self):
-            class BoundBox:
-                def __init__(self):
-                    self.XLength = 100.0
-                    self.YLength = 50.0
-                    self.ZLength = 25.0
-            return BoundBox()
-    
     mock_doc = MockDocument("TestPart")
     
-    # Patch the local analyzer to return our known result
-    with patch.object(LocalCADAnalyzer, 'analyze_document', return_value=local_result):
-        # Create a cloud analyzer
-        analyzer = get_analyzer()
+    # Scope the module and HTTP mocks to this test so nothing leaks into sys.modules
+    with patch.dict(sys.modules, freecad_module_mocks()), \
+         patch('requests.get', side_effect=mock_cloud_get), \
+         patch('requests.post', side_effect=mock_cloud_post):
+        from cloud_client import CloudApiClient
+        from cloud_cad_analyzer import get_analyzer
+        from local_cad_analyzer import LocalCADAnalyzer
         
-        # Force the cloud client to fail
-        def mock_analyze_cad(*args, **kwargs):
-            raise Exception("All cloud endpoints failed")
-        
-        # Apply the patch to the cloud client
-        with patch.object(CloudApiClient, 'analyze_cad', side_effect=mock_analyze_cad):
-            # Capture the output during analysis
-            result, output = capture_output(analyzer.analyze_document, mock_doc)
+        # Patch the local analyzer to return our known result
+        with patch.object(LocalCADAnalyzer, 'analyze_document', return_value=local_result):
+            # Create a cloud analyzer
+            analyzer = get_analyzer()
+            
+            # Force the cloud client to fail
+            def mock_analyze_cad(*args, **kwargs):
+                raise Exception("All cloud endpoints failed")
+            
+            # Apply the patch to the cloud client
+            with patch.object(CloudApiClient, 'analyze_cad', side_effect=mock_analyze_cad):
+                # Capture the output during analysis
+                result, output = capture_output(analyzer.analyze_document, mock_doc)
     
     # Check the result
     print("\nAnalysis Result:")
@@ -4,13 +4,15 @@ Test script for the cloud proxy integration
 Tests both direct cloud connection and local server proxy
 """
 
-import json
 import logging
 import sys
 import time
+from itertools import islice
 from urllib.request import Request, urlopen
 from urllib.error import URLError, HTTPError
 
+from test_utils import decode_json, encode_json
+
 # Configure logging
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
 logger = logging.getLogger(__name__)
@@ -20,6 +22,9 @@ LOCAL_SERVER_URL = "http://localhost:8090/api/v2/analyze"
 CLOUD_SERVER_URL = "http://localhost:8080/api/v2/analyze"
 API_KEY = "test-api-key"
 
+# Both server tests send the same timestamp so their payloads are identical
+RUN_TIMESTAMP = time.strftime("%Y-%m-%dT%H:%M:%SZ")
+
 def test_server(url, api_key, test_name="Unknown"):
     """Test a server endpoint with a sample request"""
     logger.info(f"=== STARTING {test_name} TEST ===")
@@ -52,7 +57,7 @@ def test_server(url, api_key, test_name="Unknown"):
             "use_advanced_dfm": True,
             "include_cost_analysis": True
         },
-        "timestamp": time.strftime("%Y-%m-%dT%H:%M:%SZ"),
+        "timestamp": RUN_TIMESTAMP,
         "source": "test_script"
     }
     
@@ -63,8 +68,8 @@ def test_server(url, api_key, test_name="Unknown"):
             "X-API-Key": api_key
         }
         
-        # Convert payload to JSON string
-        data = json.dumps(payload).encode('utf-8')
+        # Serialize payload straight to bytes
+        data = encode_json(payload)
         
         # Create request
         logger.info("Sending request...")
@@ -73,8 +78,13 @@ def test_server(url, api_key, test_name="Unknown"):
         # Send request
         with urlopen(req, timeout=30) as response:
             # Read response
-            response_data = response.read().decode('utf-8')
-            response_json = json.loads(response_data)
+            response_data = response.read()
+            response_json = decode_json(response_data)
+            
+            # Preview the raw body only when debug logging is enabled
+            if logger.isEnabledFor(logging.DEBUG):
+                preview = response_data[:200].decode('utf-8', 'replace')
+                logger.debug("Raw response (%d bytes): %s", len(response_data), preview)
             
             # Log status
             logger.info(f"Response status code: 200")
@@ -95,16 +105,16 @@ def test_server(url, api_key, test_name="Unknown"):
             logger.info(f"Issues count: {len(issues)}")
             if issues:
                 logger.info("Sample issues:")
-                for i, issue in enumerate(issues[:3]):  # Show up to 3 issues
-                    logger.info(f"  Issue {i+1}: {issue.get('message')} (Severity: {issue.get('severity')})")
+                for i, issue in enumerate(islice(issues, 3), 1):  # Show up to 3 issues
+                    logger.info(f"  Issue {i}: {issue.get('message')} (Severity: {issue.get('severity')})")
             
             # Check for recommendations
             recommendations = response_json.get("recommendations", [])
             logger.info(f"Recommendations count: {len(recommendations)}")
             if recommendations:
                 logger.info("Sample recommendations:")
-                for i, rec in enumerate(recommendations[:3]):  # Show up to 3 recommendations
-                    logger.info(f"  Recommendation {i+1}: {rec}")
+                for i, rec in enumerate(islice(recommendations, 3), 1):  # Show up to 3 recommendations
+                    logger.info(f"  Recommendation {i}: {rec}")
             
             # Check for cost estimate
             cost = response_json.get("cost_estimate", {})
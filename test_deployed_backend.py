@@ -2,10 +2,10 @@
 """
 Test script to verify the deployed backend with a properly formatted request
 """
-import json
 import requests
 import logging
-import time
+
+from test_utils import HEADERS, decode_json, dumps_json, make_session, timed
 
 # Configure logging
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
@@ -15,33 +15,29 @@ logger = logging.getLogger(__name__)
 BACKEND_URL = "https://freecad-copilot-fixed-4cmxv2m7cq-el.a.run.app/api/v2/analyze"
 API_KEY = "test-api-key"
 
+# Shared session: keep-alive connection and headers are set up once
+SESSION = make_session({**HEADERS, "X-API-Key": API_KEY})
+
 def load_test_request(file_path):
     """Load test request from JSON file"""
     try:
-        with open(file_path, 'r') as f:
-            return json.load(f)
+        with open(file_path, 'rb') as f:
+            return decode_json(f.read())
     except Exception as e:
         logger.error(f"Error loading test request: {str(e)}")
         return None
 
 def send_request(data):
     """Send request to backend API"""
-    headers = {
-        "Content-Type": "application/json",
-        "X-API-Key": API_KEY
-    }
-    
     try:
         logger.info(f"Sending request to {BACKEND_URL}...")
-        start_time = time.time()
-        response = requests.post(BACKEND_URL, json=data, headers=headers, timeout=30)
-        elapsed_time = time.time() - start_time
+        with timed("Request completed", logger.info):
+            response = SESSION.post(BACKEND_URL, json=data, timeout=(5, 30))
         
-        logger.info(f"Request completed in {elapsed_time:.2f} seconds")
         logger.info(f"Status code: {response.status_code}")
         
         if response.status_code == 200:
-            return response.json()
+            return decode_json(response.content)
         else:
             logger.error(f"Error response: {response.text}")
             return None
@@ -82,9 +78,11 @@ def analyze_response(response):
         for i, rec in enumerate(recommendations):
             logger.info(f"  {i+1}. {rec}")
     
-    # Print the full response for debugging
-    logger.info("\nFull response:")
-    logger.info(json.dumps(response, indent=2))
+    logger.info(f"Response keys: {list(response.keys())}")
+    
+    # Only serialize the full response when debug logging is enabled
+    if logger.isEnabledFor(logging.DEBUG):
+        logger.debug("Full response: %s", dumps_json(response))
 
 def main():
     """Main function"""
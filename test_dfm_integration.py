@@ -6,11 +6,11 @@ This script simulates the interaction between the FreeCAD plugin and the backend
 for advanced DFM analysis. It sends a sample CAD model for analysis and displays the results.
 """
 
+import sys
 import requests
-import json
-import time
 import logging
-from pprint import pprint
+
+from test_utils import ANALYSIS_TIMEOUT, HEADERS, decode_json, encode_json, iter_json_items, make_session, timed
 
 # Configure logging
 logging.basicConfig(
@@ -23,6 +23,9 @@ logger = logging.getLogger(__name__)
 API_URL = "http://localhost:8000/api/v2/analysis/dfm"
 API_KEY = "dev_api_key_for_testing"  # Default development API key
 
+# Pooled session reused for every request
+SESSION = make_session({**HEADERS, "X-API-Key": API_KEY})
+
 def create_sample_cad_data():
     """Create a sample CAD model for testing"""
     return {
@@ -61,114 +64,180 @@ def create_sample_cad_data():
         "faces": 24
     }
 
+# Fields shared by every DFM request; the processes tuple keeps the template immutable
+REQUEST_TEMPLATE = {
+    "material": "ALUMINUM",
+    "production_volume": 100,
+    "processes": ("CNC_MILLING", "INJECTION_MOLDING", "FDM_PRINTING")
+}
+
 def create_dfm_request(cad_data, material="ALUMINUM", volume=100):
     """Create a DFM analysis request"""
-    return {
-        "cad_data": cad_data,
-        "material": material,
-        "production_volume": volume,
-        "processes": ["CNC_MILLING", "INJECTION_MOLDING", "FDM_PRINTING"]
-    }
+    return {**REQUEST_TEMPLATE, "cad_data": cad_data, "material": material, "production_volume": volume}
 
-def send_dfm_request(request_data):
-    """Send DFM analysis request to API"""
-    headers = {
-        "Content-Type": "application/json",
-        "X-API-Key": API_KEY
-    }
+# The sample request never changes, so build and encode it once at import
+SAMPLE_REQUEST = create_dfm_request(create_sample_cad_data())
+SAMPLE_REQUEST_BODY = encode_json(SAMPLE_REQUEST)
+
+def send_dfm_request(request_data, body=None, stream=False):
+    """Send DFM analysis request to API
     
+    body may be the pre-encoded request_data; otherwise it is encoded here.
+    With stream=True the response is returned unread for display_results_streaming,
+    otherwise the parsed results are returned.
+    """
     logger.info(f"Sending DFM analysis request for {request_data['cad_data']['part_name']}")
     
     try:
-        response = requests.post(API_URL, json=request_data, headers=headers)
+        response = SESSION.post(
+            API_URL,
+            data=body if body is not None else encode_json(request_data),
+            stream=stream,
+            timeout=ANALYSIS_TIMEOUT
+        )
         response.raise_for_status()
-        return response.json()
+        if stream:
+            return response
+        return decode_json(response.content)
     except requests.exceptions.RequestException as e:
         logger.error(f"API request failed: {e}")
         if hasattr(e, 'response') and e.response:
             logger.error(f"Response: {e.response.text}")
         raise
 
-def display_results(results):
-    """Display DFM analysis results in a user-friendly format"""
-    print("\n" + "="*50)
-    print(f"DFM ANALYSIS RESULTS FOR: {results['cad_data']['part_name']}")
-    print("="*50)
-    
-    # Overall manufacturability
-    print(f"\nMANUFACTURABILITY SCORE: {results.get('manufacturability_score', 'N/A')}/100")
-    
-    # Issues
-    if 'issues' in results and results['issues']:
-        print("\nMANUFACTURING ISSUES:")
-        for issue in results['issues']:
-            print(f"  • [{issue['severity'].upper()}] {issue['message']}")
-            if 'recommendation' in issue:
-                print(f"    → Recommendation: {issue['recommendation']}")
-    else:
-        print("\nNo manufacturing issues detected.")
+def score_lines(score):
+    """Format the overall manufacturability score"""
+    return [f"\nMANUFACTURABILITY SCORE: {score}/100"]
+
+def issue_lines(issues):
+    """Format the manufacturing issues"""
+    if not issues:
+        return ["\nNo manufacturing issues detected."]
     
-    # Process recommendations
-    if 'process_suitability' in results and results['process_suitability']:
-        print("\nPROCESS RECOMMENDATIONS:")
-        for i, process in enumerate(results['process_suitability'], 1):
-            print(f"\n{i}. {process['process'].replace('_', ' ')} - Score: {process['suitability_score']}/100")
-            print(f"   Manufacturability: {process['manufacturability']}")
-            print(f"   Estimated Cost: ${process.get('estimated_unit_cost', 'N/A')}")
-            print(f"   Lead Time: {process.get('estimated_lead_time', 'N/A')} days")
+    lines = ["\nMANUFACTURING ISSUES:"]
+    a = lines.append
+    for issue in issues:
+        a(f"  • [{issue['severity'].upper()}] {issue['message']}")
+        if 'recommendation' in issue:
+            a(f"    → Recommendation: {issue['recommendation']}")
+    return lines
+
+def process_suitability_lines(processes):
+    """Format the process recommendations"""
+    lines = []
+    if processes:
+        a = lines.append
+        a("\nPROCESS RECOMMENDATIONS:")
+        for i, process in enumerate(processes, 1):
+            get = process.get
+            a(f"\n{i}. {process['process'].replace('_', ' ')} - Score: {process['suitability_score']}/100")
+            a(f"   Manufacturability: {process['manufacturability']}")
+            a(f"   Estimated Cost: ${get('estimated_unit_cost', 'N/A')}")
+            a(f"   Lead Time: {get('estimated_lead_time', 'N/A')} days")
             
-            if 'advantages' in process and process['advantages']:
-                print("   Advantages:")
-                for adv in process['advantages']:
-                    print(f"    ✓ {adv}")
+            if get('advantages'):
+                a("   Advantages:")
+                lines.extend(f"    ✓ {adv}" for adv in process['advantages'])
                     
-            if 'limitations' in process and process['limitations']:
-                print("   Limitations:")
-                for lim in process['limitations']:
-                    print(f"    ✗ {lim}")
+            if get('limitations'):
+                a("   Limitations:")
+                lines.extend(f"    ✗ {lim}" for lim in process['limitations'])
+    return lines
+
+def metadata_lines(meta):
+    """Format the complexity analysis and machining time estimates"""
+    lines = []
+    a = lines.append
     
     # Complexity analysis
-    if 'metadata' in results and 'complexity_score' in results['metadata']:
-        print(f"\nCOMPLEXITY ANALYSIS:")
-        print(f"  • Overall Complexity: {results['metadata']['complexity_rating']} ({results['metadata']['complexity_score']}/100)")
+    if 'complexity_score' in meta:
+        a("\nCOMPLEXITY ANALYSIS:")
+        a(f"  • Overall Complexity: {meta['complexity_rating']} ({meta['complexity_score']}/100)")
         
-        if 'complexity_factors' in results['metadata']:
-            factors = results['metadata']['complexity_factors']
-            print("  • Complexity Factors:")
-            for factor, value in factors.items():
-                print(f"    - {factor.replace('_', ' ').title()}: {value}")
+        if 'complexity_factors' in meta:
+            a("  • Complexity Factors:")
+            lines.extend(
+                f"    - {factor.replace('_', ' ').title()}: {value}"
+                for factor, value in meta['complexity_factors'].items()
+            )
     
     # Machining time
-    if 'metadata' in results and 'machining_time' in results['metadata']:
-        times = results['metadata']['machining_time']
-        print(f"\nESTIMATED MACHINING TIME:")
-        print(f"  • Total Time: {times.get('total_time_minutes', 'N/A')} minutes")
-        print(f"  • Setup Time: {times.get('setup_time_minutes', 'N/A')} minutes")
-        print(f"  • Rough Machining: {times.get('rough_machining_minutes', 'N/A')} minutes")
-        print(f"  • Finish Machining: {times.get('finish_machining_minutes', 'N/A')} minutes")
-        print(f"  • Hole Operations: {times.get('hole_operations_minutes', 'N/A')} minutes")
+    if 'machining_time' in meta:
+        get = meta['machining_time'].get
+        a("\nESTIMATED MACHINING TIME:")
+        a(f"  • Total Time: {get('total_time_minutes', 'N/A')} minutes")
+        a(f"  • Setup Time: {get('setup_time_minutes', 'N/A')} minutes")
+        a(f"  • Rough Machining: {get('rough_machining_minutes', 'N/A')} minutes")
+        a(f"  • Finish Machining: {get('finish_machining_minutes', 'N/A')} minutes")
+        a(f"  • Hole Operations: {get('hole_operations_minutes', 'N/A')} minutes")
+    return lines
+
+# Result sections in display order, keyed by their top-level response field
+RESULT_SECTIONS = (
+    ('manufacturability_score', score_lines),
+    ('issues', issue_lines),
+    ('process_suitability', process_suitability_lines),
+    ('metadata', metadata_lines),
+)
+
+# Sections still displayed (with their default) when the field is missing
+DEFAULT_SECTIONS = {'manufacturability_score': 'N/A', 'issues': None}
+
+RULE = "="*50
+
+def header_lines(part_name):
+    """Format the results banner for a part"""
+    return ["\n" + RULE, f"DFM ANALYSIS RESULTS FOR: {part_name}", RULE]
+
+def write_lines(lines):
+    """Write the lines to stdout in a single call"""
+    if lines:
+        sys.stdout.write("\n".join(lines) + "\n")
+
+def display_results(results):
+    """Display DFM analysis results in a user-friendly format"""
+    lines = header_lines(results['cad_data']['part_name'])
     
-    print("\n" + "="*50)
+    for key, format_section in RESULT_SECTIONS:
+        if key in results:
+            lines += format_section(results[key])
+        elif key in DEFAULT_SECTIONS:
+            lines += format_section(DEFAULT_SECTIONS[key])
+    
+    lines.append("\n" + RULE)
+    write_lines(lines)
+
+def display_results_streaming(response, part_name):
+    """Display DFM analysis results from a streamed response
+    
+    Each section is written as soon as its field has been parsed, so the sections
+    follow the order the server sends them in rather than the display_results order
+    """
+    formatters = dict(RESULT_SECTIONS)
+    seen = set()
+    
+    write_lines(header_lines(part_name))
+    
+    for key, value in iter_json_items(response):
+        if key in formatters:
+            write_lines(formatters[key](value))
+            seen.add(key)
+    
+    for key, default in DEFAULT_SECTIONS.items():
+        if key not in seen:
+            write_lines(formatters[key](default))
+    
+    write_lines(["\n" + RULE])
 
 def main():
     """Main function"""
     try:
-        # Create sample CAD data
-        cad_data = create_sample_cad_data()
-        
-        # Create DFM request
-        request = create_dfm_request(cad_data)
-        
-        # Send request to API
-        start_time = time.time()
-        results = send_dfm_request(request)
-        end_time = time.time()
-        
-        # Display results
-        display_results(results)
-        
-        # Display performance
-        print(f"\nRequest completed in {end_time - start_time:.2f} seconds")
+        # Send the pre-built sample request to the API
+        with timed("\nRequest completed"):
+            response = send_dfm_request(SAMPLE_REQUEST, SAMPLE_REQUEST_BODY, stream=True)
+            
+            # Display results as they arrive
+            display_results_streaming(response, SAMPLE_REQUEST['cad_data']['part_name'])
         
         return 0
     except Exception as e:
@@ -2,12 +2,13 @@
 """
 Test script to verify dynamic manufacturability analysis with different CAD models
 """
-import json
-import requests
 import time
 import sys
 import logging
-from pprint import pprint
+
+import requests
+
+from test_utils import ANALYSIS_TIMEOUT, HEADERS, decode_json, encode_json, make_session
 
 # Configure logging
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
@@ -20,8 +21,12 @@ CLOUD_ENDPOINT = "https://freecad-copilot-fixed-ue4roa4m4a-el.a.run.app/api/v1/e
 # Choose which endpoint to use (local or cloud)
 USE_CLOUD = True
 API_ENDPOINT = CLOUD_ENDPOINT if USE_CLOUD else LOCAL_ENDPOINT
+BATCH_ENDPOINT = f"{API_ENDPOINT}/batch"
 API_KEY = "test-api-key"  # Using the test key that's accepted by our modified backend
 
+# Pooled session reused across the analysis requests
+SESSION = make_session({**HEADERS, "X-API-Key": API_KEY})
+
 def create_test_cad_data(part_name, volume, surface_area, bounding_box):
     """Create test CAD data with different geometries"""
     return {
@@ -34,93 +39,148 @@ def create_test_cad_data(part_name, volume, surface_area, bounding_box):
         "thin_walls": []
     }
 
-def test_analysis(cad_data, material="PLA", process="FDM_PRINTING"):
-    """Test the analysis endpoint with the given CAD data"""
-    payload = {
-        "cad_data": cad_data,
-        "material": material,
-        "process": process,
-        "production_volume": 100,
-        "advanced_analysis": True
-    }
+# Fields shared by every analysis request
+PAYLOAD_TEMPLATE = {
+    "material": "PLA",
+    "process": "FDM_PRINTING",
+    "production_volume": 100,
+    "advanced_analysis": True
+}
+
+def create_analysis_payload(cad_data, material="PLA", process="FDM_PRINTING"):
+    """Create the analysis request payload for the given CAD data"""
+    return {**PAYLOAD_TEMPLATE, "cad_data": cad_data, "material": material, "process": process}
+
+# Test 1: Good part with reasonable dimensions
+GOOD_PART = create_test_cad_data(
+    "good_part",
+    volume=500.0,
+    surface_area=300.0,
+    bounding_box={"length": 100.0, "width": 80.0, "height": 60.0}
+)
+
+# Test 2: Part with thin walls (low volume to surface area ratio)
+THIN_WALL_PART = create_test_cad_data(
+    "thin_wall_part",
+    volume=50.0,
+    surface_area=300.0,  # Same surface area but much lower volume
+    bounding_box={"length": 100.0, "width": 80.0, "height": 60.0}
+)
+
+# Test 3: Part with high aspect ratio
+HIGH_ASPECT_RATIO_PART = create_test_cad_data(
+    "high_aspect_ratio_part",
+    volume=500.0,
+    surface_area=300.0,
+    bounding_box={"length": 200.0, "width": 10.0, "height": 5.0}  # Very long and thin
+)
+
+# Request bodies for the fixed test parts, encoded once at import
+GOOD_PART_BODY = encode_json(create_analysis_payload(GOOD_PART))
+THIN_WALL_PART_BODY = encode_json(create_analysis_payload(THIN_WALL_PART))
+HIGH_ASPECT_RATIO_PART_BODY = encode_json(create_analysis_payload(HIGH_ASPECT_RATIO_PART))
+
+def log_analysis_result(cad_data, result):
+    """Log the key information from an analysis result"""
+    score = result.get("overall_manufacturability_score", 0)
+    rating = result.get("overall_rating", "UNKNOWN")
+    issues = result.get("manufacturing_issues", [])
+    recommendations = result.get("expert_recommendations", [])
     
-    headers = {
-        "Content-Type": "application/json",
-        "X-API-Key": API_KEY
-    }
+    # Lazy %-style arguments so the per-issue messages are only formatted
+    # when INFO logging is enabled
+    logger.info("Analysis results for %s:", cad_data['part_name'])
+    logger.info("Score: %s/100 (%s)", score, rating)
+    logger.info("Found %d manufacturing issues", len(issues))
     
-    logger.info(f"Testing analysis for part: {cad_data['part_name']}")
-    logger.info(f"Volume: {cad_data['volume']}, Surface Area: {cad_data['surface_area']}")
+    if issues:
+        logger.info("Issues:")
+        for i, issue in enumerate(issues, 1):
+            get = issue.get
+            logger.info("  %d. %s (Severity: %s)", i, get('message', ''), get('severity', 'unknown'))
+            logger.info("     Recommendation: %s", get('recommendation', 'None'))
+    
+    if recommendations:
+        logger.info("Recommendations:")
+        for i, rec in enumerate(recommendations, 1):
+            logger.info("  %d. %s", i, rec)
+
+def test_analysis(cad_data, material="PLA", process="FDM_PRINTING", body=None):
+    """Test the analysis endpoint with the given CAD data
+    
+    body may be a pre-encoded request payload; otherwise one is built from the arguments
+    """
+    if body is None:
+        body = encode_json(create_analysis_payload(cad_data, material, process))
+    
+    logger.info("Testing analysis for part: %s", cad_data['part_name'])
+    logger.info("Volume: %s, Surface Area: %s", cad_data['volume'], cad_data['surface_area'])
     
     try:
-        response = requests.post(API_ENDPOINT, json=payload, headers=headers)
+        response = SESSION.post(API_ENDPOINT, data=body, timeout=ANALYSIS_TIMEOUT)
         response.raise_for_status()
-        result = response.json()
-        
-        # Extract key information
-        score = result.get("overall_manufacturability_score", 0)
-        rating = result.get("overall_rating", "UNKNOWN")
-        issues = result.get("manufacturing_issues", [])
-        recommendations = result.get("expert_recommendations", [])
-        
-        logger.info(f"Analysis results for {cad_data['part_name']}:")
-        logger.info(f"Score: {score}/100 ({rating})")
-        logger.info(f"Found {len(issues)} manufacturing issues")
-        
-        if issues:
-            logger.info("Issues:")
-            for i, issue in enumerate(issues):
-                logger.info(f"  {i+1}. {issue.get('message', '')} (Severity: {issue.get('severity', 'unknown')})")
-                logger.info(f"     Recommendation: {issue.get('recommendation', 'None')}")
-        
-        if recommendations:
-            logger.info("Recommendations:")
-            for i, rec in enumerate(recommendations):
-                logger.info(f"  {i+1}. {rec}")
-        
+        result = decode_json(response.content)
+        log_analysis_result(cad_data, result)
         return result
     
     except Exception as e:
-        logger.error(f"Error testing analysis: {str(e)}")
+        logger.error("Error testing analysis: %s", e)
         return None
 
-def main():
-    """Run tests with different CAD models"""
-    # Test 1: Good part with reasonable dimensions
-    good_part = create_test_cad_data(
-        "good_part",
-        volume=500.0,
-        surface_area=300.0,
-        bounding_box={"length": 100.0, "width": 80.0, "height": 60.0}
-    )
+def run_analysis_batch(parts, material="PLA", process="FDM_PRINTING", bodies=None):
+    """Test several parts with a single request to the batch endpoint
     
-    # Test 2: Part with thin walls (low volume to surface area ratio)
-    thin_wall_part = create_test_cad_data(
-        "thin_wall_part",
-        volume=50.0,
-        surface_area=300.0,  # Same surface area but much lower volume
-        bounding_box={"length": 100.0, "width": 80.0, "height": 60.0}
-    )
+    Falls back to one request per part (reusing any pre-encoded bodies) when the
+    batch request fails for any reason, such as a server without a batch endpoint,
+    or returns a different number of results.
+    Returns the results in the same order as parts.
+    """
+    def analyze_individually():
+        return [
+            test_analysis(part, material, process, body)
+            for part, body in zip(parts, bodies or [None] * len(parts))
+        ]
     
-    # Test 3: Part with high aspect ratio
-    high_aspect_ratio_part = create_test_cad_data(
-        "high_aspect_ratio_part",
-        volume=500.0,
-        surface_area=300.0,
-        bounding_box={"length": 200.0, "width": 10.0, "height": 5.0}  # Very long and thin
-    )
+    logger.info("Testing batch analysis for %d parts", len(parts))
+    payload = {"requests": [create_analysis_payload(part, material, process) for part in parts]}
     
-    # Run tests
-    logger.info("Starting dynamic analysis tests...")
+    try:
+        response = SESSION.post(BATCH_ENDPOINT, data=encode_json(payload), timeout=ANALYSIS_TIMEOUT)
+        if response.status_code == 404:
+            logger.info("Batch endpoint not available, sending individual requests")
+            return analyze_individually()
+        
+        response.raise_for_status()
+        results = decode_json(response.content).get("results", [])
+    except (requests.RequestException, ValueError, AttributeError) as e:
+        # Connection errors, other HTTP errors (e.g. 405/422 from a router
+        # without /batch, or 5xx) and unparseable bodies
+        logger.warning("Batch analysis failed (%s), sending individual requests", e)
+        return analyze_individually()
     
-    logger.info("\n\n=== TEST 1: GOOD PART ===")
-    good_result = test_analysis(good_part)
+    if len(results) != len(parts):
+        logger.warning("Batch endpoint returned %d results for %d parts, sending individual requests",
+                       len(results), len(parts))
+        return analyze_individually()
     
-    logger.info("\n\n=== TEST 2: THIN WALL PART ===")
-    thin_wall_result = test_analysis(thin_wall_part)
+    for part, result in zip(parts, results):
+        log_analysis_result(part, result)
+    return results
+
+def main():
+    """Run tests with different CAD models"""
+    # Run tests
+    logger.info("Starting dynamic analysis tests...")
     
-    logger.info("\n\n=== TEST 3: HIGH ASPECT RATIO PART ===")
-    aspect_ratio_result = test_analysis(high_aspect_ratio_part)
+    # All three parts go out in one batch request when the server supports it
+    logger.info("\n\n=== TESTS 1-3: GOOD, THIN WALL AND HIGH ASPECT RATIO PARTS ===")
+    # A part whose analysis failed is reported with empty results
+    good_result, thin_wall_result, aspect_ratio_result = (
+        result or {} for result in run_analysis_batch(
+            (GOOD_PART, THIN_WALL_PART, HIGH_ASPECT_RATIO_PART),
+            bodies=(GOOD_PART_BODY, THIN_WALL_PART_BODY, HIGH_ASPECT_RATIO_PART_BODY)
+        )
+    )
     
     # Compare results to verify dynamic behavior
     logger.info("\n\n=== COMPARISON OF RESULTS ===")
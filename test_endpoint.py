@@ -1,14 +1,41 @@
 #!/usr/bin/env python3
-import json
-import requests
 import sys
+from concurrent.futures import ThreadPoolExecutor
+
+from test_utils import HEADERS, PROBE_TIMEOUT, load_cloud_config, make_session
+
+# Pooled session; auth headers are added once the config has been loaded
+SESSION = make_session(HEADERS)
+
+def probe_endpoint(full_url, payload):
+    """POST the test payload to one endpoint and return the report text"""
+    try:
+        response = SESSION.post(
+            full_url, 
+            json=payload, 
+            timeout=PROBE_TIMEOUT
+        )
+        
+        lines = [
+            f"Status: {response.status_code}",
+            # Decode only the bytes being previewed rather than the whole body
+            f"Response preview: {response.content[:200].decode('utf-8', 'replace')}..."
+        ]
+        
+        if response.status_code == 200:
+            lines.append("✅ Endpoint working!")
+        else:
+            lines.append("❌ Endpoint returned error status")
+        return "\n".join(lines)
+    
+    except Exception as e:
+        return f"❌ Error testing endpoint: {e}"
 
 def test_cloud_connection():
     """Test connection to the cloud API"""
     try:
         # Load config
-        with open('cloud_config.json', 'r') as f:
-            config = json.load(f)
+        config = load_cloud_config()
         
         # Get API URL and key
         api_url = config.get('cloud_api_url')
@@ -20,52 +47,42 @@ def test_cloud_connection():
         print(f"Default endpoint: {default_endpoint}")
         print(f"Fallback endpoints: {fallback_endpoints}")
         
-        # Test health endpoint
-        print("\n=== Testing health endpoint ===")
-        health_url = f"{api_url}/health"
-        print(f"URL: {health_url}")
-        
-        headers = {
+        SESSION.headers.update({
             'Authorization': f"Bearer {api_key}",
             'X-API-Key': api_key
-        }
+        })
         
-        health_response = requests.get(health_url, headers=headers, timeout=5)
-        print(f"Status: {health_response.status_code}")
-        print(f"Response: {health_response.text}")
+        health_url = f"{api_url}/health"
+        endpoints = [default_endpoint, *fallback_endpoints]
+        urls = [f"{api_url}{endpoint}" for endpoint in endpoints]
         
-        # Test all endpoints
-        endpoints = [default_endpoint] + fallback_endpoints
+        payload = {
+            'message': 'Test message from FreeCAD Co-Pilot',
+            'timestamp': '2025-07-15T23:42:16',
+            'mode': 'general'
+        }
         
-        for endpoint in endpoints:
-            print(f"\n=== Testing endpoint: {endpoint} ===")
-            full_url = f"{api_url}{endpoint}"
-            print(f"URL: {full_url}")
-            
-            payload = {
-                'message': 'Test message from FreeCAD Co-Pilot',
-                'timestamp': '2025-07-15T23:42:16',
-                'mode': 'general'
-            }
+        # The health check and endpoint probes are independent, so issue them
+        # concurrently on the pooled session and report in the usual order
+        with ThreadPoolExecutor(max_workers=len(endpoints) + 1) as executor:
+            health_future = executor.submit(SESSION.get, health_url, timeout=PROBE_TIMEOUT)
+            endpoint_futures = [
+                executor.submit(probe_endpoint, full_url, payload)
+                for full_url in urls
+            ]
             
-            try:
-                response = requests.post(
-                    full_url, 
-                    json=payload, 
-                    headers=headers, 
-                    timeout=10
-                )
-                
-                print(f"Status: {response.status_code}")
-                print(f"Response preview: {response.text[:200]}...")
-                
-                if response.status_code == 200:
-                    print("✅ Endpoint working!")
-                else:
-                    print("❌ Endpoint returned error status")
+            # Test health endpoint
+            print("\n=== Testing health endpoint ===")
+            print(f"URL: {health_url}")
+            health_response = health_future.result()
+            print(f"Status: {health_response.status_code}")
+            print(f"Response: {health_response.text}")
             
-            except Exception as e:
-                print(f"❌ Error testing endpoint: {e}")
+            # Test all endpoints
+            for endpoint, full_url, future in zip(endpoints, urls, endpoint_futures):
+                print(f"\n=== Testing endpoint: {endpoint} ===")
+                print(f"URL: {full_url}")
+                print(future.result())
         
         return True
     
@@ -6,60 +6,80 @@ This script can be run directly to test the engineering analysis functionality w
 
 import os
 import sys
-import json
-import traceback
 
 # Add macro directory to path
 MACRO_DIR = os.path.dirname(os.path.realpath(__file__))
 if MACRO_DIR not in sys.path:
     sys.path.append(MACRO_DIR)
 
-# Try to import FreeCAD
-try:
-    import FreeCAD
-    import Part
-except ImportError:
-    print("Error: FreeCAD module not found. This script must be run with FreeCAD's Python interpreter.")
-    print("Try running: freecadcmd test_engineering_analysis.py")
-    sys.exit(1)
+from test_utils import dumps_json
 
-# Import our modules
-try:
-    from macro import cloud_cad_analyzer
-    from macro import engineering_analyzer
-except ImportError as e:
-    print(f"Error importing modules: {e}")
-    print("Make sure all required files are in the macro directory.")
-    sys.exit(1)
+# FreeCAD loads its shared libraries on import, so it is only imported the first
+# time a test needs it and then reused
+_freecad = None
+
+def load_freecad():
+    """Import FreeCAD on first use and return the module"""
+    global _freecad
+    if _freecad is None:
+        try:
+            import FreeCAD
+            import Part  # Registers the Part:: document object types
+        except ImportError:
+            print("Error: FreeCAD module not found. This script must be run with FreeCAD's Python interpreter.")
+            print("Try running: freecadcmd test_engineering_analysis.py")
+            sys.exit(1)
+        _freecad = FreeCAD
+    return _freecad
+
+def load_cloud_cad_analyzer():
+    """Import the cloud CAD analyzer module, exiting with a hint if it is unavailable"""
+    try:
+        from macro import cloud_cad_analyzer
+        from macro import engineering_analyzer  # Used by analyze_engineering_only
+    except ImportError as e:
+        print(f"Error importing modules: {e}")
+        print("Make sure all required files are in the macro directory.")
+        sys.exit(1)
+    return cloud_cad_analyzer
+
+# Fillet specs for all 12 edges of a box: (edge_index, radius, radius)
+FILLET_EDGES = tuple((i, 5.0, 5.0) for i in range(1, 13))
 
 def create_test_document():
     """Create a simple test document with a box shape"""
+    FreeCAD = load_freecad()
     doc = FreeCAD.newDocument("TestDocument")
     
-    # Create a box
-    box = doc.addObject("Part::Box", "Box")
-    box.Length = 100
-    box.Width = 50
-    box.Height = 25
-    
-    # Add some fillets to test feature detection
+    # Build all objects in one transaction with recomputes frozen, so the
+    # dependency graph is only evaluated once by the recompute below
+    doc.openTransaction("build_test")
+    doc.RecomputesFrozen = True
     try:
-        # Create a second box with fillets
-        box2 = doc.addObject("Part::Box", "BoxWithFillets")
-        box2.Length = 80
-        box2.Width = 40
-        box2.Height = 20
-        box2.Placement.Base = FreeCAD.Vector(150, 0, 0)
+        # Create a box
+        box = doc.addObject("Part::Box", "Box")
+        box.Length = 100
+        box.Width = 50
+        box.Height = 25
         
-        # Add fillets to the box edges
-        fillet = doc.addObject("Part::Fillet", "Fillet")
-        fillet.Base = box2
-        edges = []
-        for i in range(1, 13):  # 12 edges in a box
-            edges.append((i, 5.0, 5.0))  # (edge_index, radius, radius)
-        fillet.Edges = edges
-    except Exception as e:
-        print(f"Warning: Could not create fillets: {e}")
+        # Add some fillets to test feature detection
+        try:
+            # Create a second box with fillets
+            box2 = doc.addObject("Part::Box", "BoxWithFillets")
+            box2.Length = 80
+            box2.Width = 40
+            box2.Height = 20
+            box2.Placement.Base = FreeCAD.Vector(150, 0, 0)
+            
+            # Add fillets to the box edges
+            fillet = doc.addObject("Part::Fillet", "Fillet")
+            fillet.Base = box2
+            fillet.Edges = list(FILLET_EDGES)
+        except Exception as e:
+            print(f"Warning: Could not create fillets: {e}")
+    finally:
+        doc.RecomputesFrozen = False
+        doc.commitTransaction()
     
     doc.recompute()
     return doc
@@ -68,6 +88,9 @@ def run_test():
     """Run the engineering analysis test"""
     print("\n=== ENGINEERING ANALYSIS TEST ===\n")
     
+    load_freecad()
+    cloud_cad_analyzer = load_cloud_cad_analyzer()
+    
     try:
         # Create test document
         print("Creating test document...")
@@ -82,7 +105,7 @@ def run_test():
         
         # Print results
         print("\nEngineering Analysis Results:")
-        print(json.dumps(result, indent=2, default=str))
+        print(dumps_json(result, indent=True, default=str))
         
         # Test visualization
         print("\nTesting visualization...")
@@ -91,6 +114,7 @@ def run_test():
         print("\n=== TEST COMPLETED SUCCESSFULLY ===\n")
         
     except Exception as e:
+        import traceback
         print(f"\nERROR: {str(e)}")
         traceback.print_exc()
         print("\n=== TEST FAILED ===\n")
@@ -9,9 +9,8 @@ This script doesn't require FreeCAD and can be run directly with Python
 import os
 import sys
 import time
-import json
-import urllib.request
-import urllib.error
+from concurrent.futures import ThreadPoolExecutor
+from unittest.mock import patch
 
 # Add the project directory to the Python path
 script_dir = os.path.dirname(os.path.realpath(__file__))
@@ -25,6 +24,39 @@ except ImportError as e:
     print(f"Error importing config: {e}")
     sys.exit(1)
 
+from test_utils import HEADERS, PROBE_TIMEOUT, encode_json, make_session
+
+# Pooled session shared by every probe
+SESSION = make_session(HEADERS)
+
+def probe_endpoint(method, url, payload=None):
+    """Send one probe request and return (result, status line)"""
+    try:
+        if method == "GET":
+            response = SESSION.get(url, timeout=PROBE_TIMEOUT)
+        else:
+            response = SESSION.post(url, json=payload, timeout=PROBE_TIMEOUT)
+        status = response.status_code
+        
+        if response.ok:
+            content = response.text
+            return {
+                "status": status,
+                "content_length": len(content),
+                "content_preview": content[:100] if len(content) > 0 else "Empty response"
+            }, f"  ✅ Status: {status}"
+        
+        return {
+            "status": status,
+            "error": response.reason
+        }, f"  ❌ HTTP Error: {status} - {response.reason}"
+        
+    except Exception as e:
+        return {
+            "status": "error",
+            "error": str(e)
+        }, f"  ❌ Error: {str(e)}"
+
 def test_cloud_endpoints():
     """Test various cloud endpoints to find which ones are available"""
     print("\n===== TESTING CLOUD ENDPOINTS =====")
@@ -33,113 +65,48 @@ def test_cloud_endpoints():
     base_url = config.CLOUD_API_URL
     print(f"Cloud URL: {base_url}")
     
-    # List of endpoints to test
-    endpoints = [
-        "/",                # Root
-        "/health",          # Health check
-        "/agents",          # Agents list
-        "/analysis",        # Analysis endpoint
-        "/api/analysis",    # Analysis with /api prefix
-        "/cad-analysis",    # Alternative name
-        "/api/cad-analysis",# Alternative with prefix
-        "/analyze"          # Another common name
+    # Endpoints to test, each with the one method it is expected to serve
+    probes = [
+        ("GET", "/"),                   # Root
+        ("GET", "/health"),             # Health check
+        ("GET", "/agents"),             # Agents list
+        ("POST", "/analysis"),          # Analysis endpoint
+        ("POST", "/api/analysis"),      # Analysis with /api prefix
+        ("POST", "/cad-analysis"),      # Alternative name
+        ("POST", "/api/cad-analysis"),  # Alternative with prefix
+        ("POST", "/analyze")            # Another common name
     ]
     
-    results = {}
+    # Simple test payload
+    payload = {
+        "metadata": {
+            "name": "test_part",
+            "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S")
+        },
+        "geometry": {
+            "faces": [10],
+            "edges": [20]
+        }
+    }
     
-    # Test each endpoint with GET
-    print("\nTesting GET endpoints:")
-    for endpoint in endpoints:
-        url = f"{base_url}{endpoint}"
-        print(f"Testing GET {url}...")
-        
-        try:
-            request = urllib.request.Request(url, method="GET")
-            response = urllib.request.urlopen(request, timeout=10)
-            status = response.status
-            content = response.read().decode('utf-8')
-            
-            print(f"  ✅ Status: {status}")
-            results[f"GET {endpoint}"] = {
-                "status": status,
-                "content_length": len(content),
-                "content_preview": content[:100] if len(content) > 0 else "Empty response"
-            }
-            
-        except urllib.error.HTTPError as e:
-            print(f"  ❌ HTTP Error: {e.code} - {e.reason}")
-            results[f"GET {endpoint}"] = {
-                "status": e.code,
-                "error": e.reason
-            }
-            
-        except Exception as e:
-            print(f"  ❌ Error: {str(e)}")
-            results[f"GET {endpoint}"] = {
-                "status": "error",
-                "error": str(e)
-            }
+    # The requests are network-bound and independent, so they run
+    # concurrently on the shared session
+    def run_probe(probe):
+        method, endpoint = probe
+        return probe_endpoint(method, f"{base_url}{endpoint}", payload if method == "POST" else None)
     
-    # Test each endpoint with POST
-    print("\nTesting POST endpoints:")
-    for endpoint in endpoints:
-        url = f"{base_url}{endpoint}"
-        print(f"Testing POST {url}...")
-        
-        # Simple test payload
-        payload = {
-            "metadata": {
-                "name": "test_part",
-                "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S")
-            },
-            "geometry": {
-                "faces": [10],
-                "edges": [20]
-            }
-        }
-        
-        try:
-            data = json.dumps(payload).encode('utf-8')
-            headers = {
-                "Content-Type": "application/json",
-                "Accept": "application/json"
-            }
-            
-            request = urllib.request.Request(
-                url, 
-                data=data, 
-                headers=headers, 
-                method="POST"
-            )
-            
-            response = urllib.request.urlopen(request, timeout=10)
-            status = response.status
-            content = response.read().decode('utf-8')
-            
-            print(f"  ✅ Status: {status}")
-            results[f"POST {endpoint}"] = {
-                "status": status,
-                "content_length": len(content),
-                "content_preview": content[:100] if len(content) > 0 else "Empty response"
-            }
-            
-        except urllib.error.HTTPError as e:
-            print(f"  ❌ HTTP Error: {e.code} - {e.reason}")
-            results[f"POST {endpoint}"] = {
-                "status": e.code,
-                "error": e.reason
-            }
-            
-        except Exception as e:
-            print(f"  ❌ Error: {str(e)}")
-            results[f"POST {endpoint}"] = {
-                "status": "error",
-                "error": str(e)
-            }
+    print(f"\nTesting {len(probes)} endpoints...")
+    results = {}
+    with ThreadPoolExecutor(max_workers=8) as executor:
+        # map() yields in submission order, so the output follows the probe list
+        for (method, endpoint), (result, status_line) in zip(probes, executor.map(run_probe, probes)):
+            print(f"Testing {method} {base_url}{endpoint}...")
+            print(status_line)
+            results[f"{method} {endpoint}"] = result
     
     # Save results to a file
-    with open('endpoint_test_results.json', 'w') as f:
-        json.dump(results, f, indent=2)
+    with open('endpoint_test_results.json', 'wb') as f:
+        f.write(encode_json(results, indent=True))
     
     print("\nResults saved to endpoint_test_results.json")
     return results
@@ -148,13 +115,9 @@ def test_fallback_simulation():
     """Simulate the fallback mechanism by using an invalid cloud URL"""
     print("\n===== TESTING FALLBACK MECHANISM SIMULATION =====")
     
-    # Save original URL
-    original_url = config.CLOUD_API_URL
-    
-    try:
-        # Set an invalid URL to force fallback
-        print(f"Original cloud URL: {config.CLOUD_API_URL}")
-        config.CLOUD_API_URL = "https://nonexistent-service-url.example.com"
+    # Set an invalid URL to force fallback; patch.object restores the original on exit
+    print(f"Original cloud URL: {config.CLOUD_API_URL}")
+    with patch.object(config, "CLOUD_API_URL", "https://nonexistent-service-url.example.com"):
         print(f"Modified cloud URL to force error: {config.CLOUD_API_URL}")
         
         # Create a simple payload
@@ -170,11 +133,8 @@ def test_fallback_simulation():
         
         print("\nThis would trigger the fallback mechanism in the full FreeCAD environment")
         print("The CloudCADAnalyzer would catch the exception and use LocalCADAnalyzer instead")
-        
-    finally:
-        # Restore original URL
-        config.CLOUD_API_URL = original_url
-        print(f"\nRestored original cloud URL: {config.CLOUD_API_URL}")
+    
+    print(f"\nRestored original cloud URL: {config.CLOUD_API_URL}")
 
 if __name__ == "__main__":
     # Test cloud endpoints
@@ -4,22 +4,38 @@ Test script for the Text-to-CAD integration
 This script tests the integration between the FreeCAD macro and the Text-to-CAD cloud service
 """
 
-import os
+import io
 import sys
 import json
-from text_to_cad_integration import TextToCADIntegration
+import unittest
+from pathlib import Path
+from unittest.mock import patch
+
+from test_utils import backend_alive, load_cloud_config, mock_response
+from ttl_cache import TTLCache
+
+CONFIG_PATH = Path(__file__).resolve().parent / "cloud_config.json"
 
 def test_text_to_cad_integration():
     """Test the Text-to-CAD integration"""
+    # Imported here so collecting this module doesn't pull in the integration
+    from text_to_cad_integration import TextToCADIntegration
+    
     print("Testing Text-to-CAD integration...")
     
+    # Skip the full connection attempt if the service doesn't answer a quick probe
+    endpoint = load_cloud_config(str(CONFIG_PATH)).get("text_to_cad_endpoint")
+    if endpoint and not backend_alive(endpoint):
+        print(f"Text-to-CAD service at {endpoint} is not reachable, skipping")
+        return False
+    
     # Initialize the Text-to-CAD integration with the correct config path
-    config_path = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'cloud_config.json')
+    config_path = str(CONFIG_PATH)
     print(f"Using config path: {config_path}")
     integration = TextToCADIntegration(config_path)
     
-    # Check if the integration is connected
-    if not integration.connected:
+    # Check if the integration is connected once its background check finishes
+    if not integration.wait_for_connection():
         print("Text-to-CAD integration is not connected")
         print(f"Cloud endpoint: {integration.endpoint if hasattr(integration, 'endpoint') else 'Not set'}")
         print(f"Last error: {integration.last_error}")
@@ -72,5 +88,62 @@ def test_text_to_cad_integration():
         print(f"❌ Text-to-CAD request failed: {result.get('message', 'Unknown error')}")
         return False
 
+def make_offline_integration():
+    """Build an integration that is marked connected without contacting the service"""
+    from text_to_cad_integration import TextToCADIntegration
+    
+    with patch.object(TextToCADIntegration, 'test_connection', return_value=False):
+        integration = TextToCADIntegration()
+        integration.wait_for_connection()
+    integration.connected = True
+    return integration
+
+def streamed_response(body):
+    """Mock a streamed 200 response whose raw body is the given bytes"""
+    response = mock_response(200)
+    response.raw = io.BytesIO(body)
+    response.content = body
+    response.__enter__.return_value = response
+    return response
+
+def test_streamed_response_parsing():
+    """send_request builds the result from the streamed body when ijson is installed"""
+    import text_to_cad_integration
+    if text_to_cad_integration.ijson is None:
+        raise unittest.SkipTest("ijson is not installed")
+    
+    integration = make_offline_integration()
+    body = b'{"success": true, "part_type": "gear", "scale": 1.5, "freecad_code": "x = 1"}'
+    with patch.object(text_to_cad_integration, '_RESULT_CACHE', TTLCache(8, 60)), \
+         patch.object(integration.session, 'post', return_value=streamed_response(body)):
+        result = integration.send_request("Generate a gear")
+    
+    assert result == {"success": True, "part_type": "gear", "scale": 1.5, "freecad_code": "x = 1"}
+    assert isinstance(result["scale"], float)
+
+def test_non_object_response():
+    """A JSON body that isn't an object is reported as an error by every parser"""
+    import text_to_cad_integration
+    
+    integration = make_offline_integration()
+    # (ijson, orjson) module combinations selecting each parsing branch
+    parsers = [(None, None)]
+    if text_to_cad_integration.ijson is not None:
+        parsers.append((text_to_cad_integration.ijson, None))
+    if text_to_cad_integration.orjson is not None:
+        parsers.append((None, text_to_cad_integration.orjson))
+    
+    for ijson_module, orjson_module in parsers:
+        response = streamed_response(b'["not", "an", "object"]')
+        response.json.return_value = ["not", "an", "object"]
+        with patch.object(text_to_cad_integration, 'ijson', ijson_module), \
+             patch.object(text_to_cad_integration, 'orjson', orjson_module), \
+             patch.object(text_to_cad_integration, '_RESULT_CACHE', TTLCache(8, 60)), \
+             patch.object(integration.session, 'post', return_value=response):
+            result = integration.send_request("Generate a gear")
+        
+        assert result["success"] is False
+        assert "expected a JSON object, got list" in result["message"]
+
 if __name__ == "__main__":
     test_text_to_cad_integration()
@@ -3,73 +3,102 @@
 Test script for local fallback mechanism in the FreeCAD CoPilot cloud services
 """
 
-import os
 import sys
-import json
 import time
+from pathlib import Path
+from concurrent.futures import ThreadPoolExecutor, TimeoutError
 
 # Add the parent directory to the path so we can import the modules
-sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+SCRIPT_DIR = Path(__file__).resolve().parent
+CONFIG_PATH = SCRIPT_DIR / "cloud_config.json"
+if str(SCRIPT_DIR) not in sys.path:
+    sys.path.insert(0, str(SCRIPT_DIR))
 
-# Import the cloud service handler
-from cloud_services.cloud_integration import CloudIntegration
-from cloud_services.service_handler import CloudServiceHandler
+from test_utils import dumps_json, load_cloud_config
+
+# Seconds to wait for each service check before reporting it as timed out
+RESULT_TIMEOUT = 10
 
 def test_cloud_integration():
     """Test the cloud integration with local fallback"""
+    # Import the cloud service handler; done here so collecting this module stays cheap
+    from cloud_services.cloud_integration import CloudIntegration
+    from cloud_services.service_handler import CloudServiceHandler
+    
     print("Testing cloud integration with local fallback...")
     
     # Load the config file
-    config_path = os.path.join(os.path.dirname(os.path.abspath(__file__)), "cloud_config.json")
+    config_path = str(CONFIG_PATH)
     
-    # Print the current config
-    with open(config_path, 'r') as f:
-        config = json.load(f)
-        print(f"Current config: {json.dumps(config, indent=2)}")
+    # Print the current config when the config asks for debug output
+    config = load_cloud_config(config_path)
+    if config.get("enable_debug_mode", False):
+        print(f"Current config: {dumps_json(config, indent=True)}")
     
     # Initialize the cloud integration
     cloud_integration = CloudIntegration(config_path)
     
+    # Direct service handler for the health check
+    service_handler = CloudServiceHandler(config_path)
+    
+    # Extract the CAD data once up front so the three services share it
+    cloud_integration.refresh_cad_data()
+    
+    # The four checks are independent, so run them concurrently and report
+    # the results in the usual order
+    executor = ThreadPoolExecutor(max_workers=4)
+    futures = {
+        "dfm": executor.submit(
+            cloud_integration.analyze_dfm,
+            manufacturing_process="3d_printing",
+            material="pla",
+            production_volume=1,
+            advanced_analysis=True
+        ),
+        "cost": executor.submit(
+            cloud_integration.estimate_cost,
+            manufacturing_process="3d_printing",
+            material="pla",
+            quantity=1,
+            region="global"
+        ),
+        "tool": executor.submit(
+            cloud_integration.recommend_tools,
+            manufacturing_process="cnc_machining",
+            material="aluminum",
+            machine_type=None
+        ),
+        "health": executor.submit(service_handler._make_api_call, "/health", {})
+    }
+    
+    # Stop waiting on any check that is still running after RESULT_TIMEOUT
+    # seconds so one hung service can't hold up the report
+    results = {}
+    for name, future in futures.items():
+        try:
+            results[name] = future.result(timeout=RESULT_TIMEOUT)
+        except TimeoutError:
+            results[name] = {"success": False, "error": f"No result after {RESULT_TIMEOUT} seconds"}
+    executor.shutdown(wait=False)
+    
     # Test DFM analysis
     print("\n=== Testing DFM Analysis ===")
-    dfm_result = cloud_integration.analyze_dfm(
-        manufacturing_process="3d_printing",
-        material="pla",
-        production_volume=1,
-        advanced_analysis=True
-    )
-    
-    print(f"DFM Analysis Result: {json.dumps(dfm_result, indent=2)}")
+    print(f"DFM Analysis Result: {dumps_json(results['dfm'], indent=True)}")
     
     # Test cost estimation
     print("\n=== Testing Cost Estimation ===")
-    cost_result = cloud_integration.estimate_cost(
-        manufacturing_process="3d_printing",
-        material="pla",
-        quantity=1,
-        region="global"
-    )
-    
-    print(f"Cost Estimation Result: {json.dumps(cost_result, indent=2)}")
+    print(f"Cost Estimation Result: {dumps_json(results['cost'], indent=True)}")
     
     # Test tool recommendation
     print("\n=== Testing Tool Recommendation ===")
-    tool_result = cloud_integration.recommend_tools(
-        manufacturing_process="cnc_machining",
-        material="aluminum",
-        machine_type=None
-    )
-    
-    print(f"Tool Recommendation Result: {json.dumps(tool_result, indent=2)}")
+    print(f"Tool Recommendation Result: {dumps_json(results['tool'], indent=True)}")
     
     # Test direct service handler
     print("\n=== Testing Direct Service Handler ===")
-    service_handler = CloudServiceHandler(config_path)
     
     # Test health endpoint
     print("\n=== Testing Health Endpoint ===")
-    health_result = service_handler._make_api_call("/health", {})
-    print(f"Health Endpoint Result: {json.dumps(health_result, indent=2)}")
+    print(f"Health Endpoint Result: {dumps_json(results['health'], indent=True)}")
     
     print("\nAll tests completed!")
 
@@ -8,32 +8,37 @@ This script will:
 4. Display the results
 """
 
-import json
-import os
 import sys
-import requests
-import pprint
+from pathlib import Path
+
+import test_utils
 
 # Add the FreeCAD plugin directory to the path so we can import its modules
-SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
-sys.path.append(os.path.join(SCRIPT_DIR, "freecad_plugin"))
+SCRIPT_DIR = Path(__file__).resolve().parent
+PLUGIN_DIR = SCRIPT_DIR / "freecad_plugin"
+CONFIG_PATH = SCRIPT_DIR / "cloud_config.json"
+if str(PLUGIN_DIR) not in sys.path:
+    sys.path.insert(0, str(PLUGIN_DIR))
+
+# Pooled session so repeated backend calls reuse one keep-alive connection
+SESSION = test_utils.make_session({**test_utils.HEADERS, "X-API-Key": "test-api-key"})
 
-# Try to import the DFM service module from the FreeCAD plugin
-try:
-    from dfm_service import DFMService
-    USING_ACTUAL_PLUGIN = True
+# Try to import the DFM service module from the FreeCAD plugin; only attempted
+# when the script runs, so importing this module has no side effects
+def load_dfm_service():
+    """Return the plugin's DFMService class, or None if the plugin is not available"""
+    try:
+        from dfm_service import DFMService
+    except ImportError:
+        print("Could not import DFMService from FreeCAD plugin, using simulation")
+        return None
     print("Using actual FreeCAD plugin DFMService")
-except ImportError:
-    USING_ACTUAL_PLUGIN = False
-    print("Could not import DFMService from FreeCAD plugin, using simulation")
+    return DFMService
 
 # Load the cloud configuration
 def load_cloud_config():
-    config_path = os.path.join(SCRIPT_DIR, "cloud_config.json")
     try:
-        with open(config_path, "r") as f:
-            config = json.load(f)
-        return config
+        return test_utils.load_cloud_config(str(CONFIG_PATH))
     except Exception as e:
         print(f"Error loading cloud config: {str(e)}")
         return {"cloud_api_url": "https://freecad-copilot-fixed-4cmxv2m7cq-el.a.run.app"}
@@ -56,22 +61,18 @@ def create_sample_payload():
 
 # Send the payload to the backend
 def send_to_backend(url, payload):
-    headers = {
-        "Content-Type": "application/json",
-        "X-API-Key": "test-api-key"
-    }
-    
     # Use the v2 API endpoint
     api_url = f"{url}/api/v2/analyze"
     print(f"Sending request to: {api_url}")
     
     try:
-        response = requests.post(api_url, json=payload, headers=headers)
+        response = SESSION.post(api_url, json=payload, timeout=test_utils.ANALYSIS_TIMEOUT)
         response.raise_for_status()
         return response.json()
     except Exception as e:
         print(f"Error sending request: {str(e)}")
-        if hasattr(response, 'text'):
+        response = getattr(e, 'response', None)
+        if response is not None:
             print(f"Response text: {response.text}")
         return None
 
@@ -115,29 +116,48 @@ class MockDFMService:
         self.last_analysis = transformed_data
         return transformed_data
 
+# List sections shown after the score: (source, key, title, item label)
+LIST_SECTIONS = (
+    ("transformed", "design_issues", "Design Issues", lambda issue: issue.get('title', 'Unknown Issue')),
+    ("transformed", "process_recommendations", "Process Recommendations", str),
+    ("transformed", "material_suggestions", "Material Suggestions", str),
+    ("response", "expert_recommendations", "Expert Recommendations", str),
+)
+
 # Main function
 def main():
+    DFMService = load_dfm_service()
+    
     # Load the cloud configuration
     config = load_cloud_config()
     cloud_api_url = config.get("cloud_api_url")
     print(f"Using cloud API URL: {cloud_api_url}")
     
+    if not test_utils.backend_alive(cloud_api_url):
+        print(f"Backend at {cloud_api_url} is not reachable, skipping request")
+        return
+    
     # Create a sample payload
     payload = create_sample_payload()
     print("Sample payload:")
-    pprint.pprint(payload)
+    print(test_utils.dumps_json(payload, indent=True))
     
     # Send the payload to the backend
     print("\nSending request to backend...")
     response = send_to_backend(cloud_api_url, payload)
     
     if response:
+        # The full response is only dumped in debug mode; the sections
+        # below report the fields the plugin actually uses
         print("\nReceived response from backend:")
-        pprint.pprint(response)
+        if config.get("enable_debug_mode", False):
+            print(test_utils.dumps_json(response, indent=True))
+        else:
+            print(f"Keys: {list(response)}")
         
         # Process the response
         print("\nProcessing response...")
-        if USING_ACTUAL_PLUGIN:
+        if DFMService is not None:
             # Use the actual FreeCAD plugin DFMService
             dfm_service = DFMService()
             transformed_data = dfm_service.transform_cloud_response(response)
@@ -147,7 +167,7 @@ def main():
             transformed_data = dfm_service.transform_response(response)
         
         print("\nTransformed data (what the FreeCAD plugin would use):")
-        pprint.pprint(transformed_data)
+        print(f"Keys: {list(transformed_data)}")
         
         # Display the manufacturability score
         if "manufacturing_features" in transformed_data:
@@ -156,33 +176,15 @@ def main():
             print(f"\nManufacturability Score: {score}/100")
             print(f"Overall Rating: {rating}")
         
-        # Display the design issues
-        if "design_issues" in transformed_data:
-            issues = transformed_data["design_issues"]
-            print(f"\nDesign Issues: {len(issues)}")
-            for i, issue in enumerate(issues):
-                print(f"  {i+1}. {issue.get('title', 'Unknown Issue')}")
-        
-        # Display the process recommendations
-        if "process_recommendations" in transformed_data:
-            recommendations = transformed_data["process_recommendations"]
-            print(f"\nProcess Recommendations: {len(recommendations)}")
-            for i, rec in enumerate(recommendations):
-                print(f"  {i+1}. {rec}")
-        
-        # Display the material suggestions
-        if "material_suggestions" in transformed_data:
-            materials = transformed_data["material_suggestions"]
-            print(f"\nMaterial Suggestions: {len(materials)}")
-            for i, mat in enumerate(materials):
-                print(f"  {i+1}. {mat}")
-        
-        # Display the expert recommendations
-        if "expert_recommendations" in response:
-            expert_recs = response["expert_recommendations"]
-            print(f"\nExpert Recommendations: {len(expert_recs)}")
-            for i, rec in enumerate(expert_recs):
-                print(f"  {i+1}. {rec}")
+        # Display the list sections; expert recommendations are only in the raw response
+        sources = {"transformed": transformed_data, "response": response}
+        for source, key, title, label in LIST_SECTIONS:
+            items = sources[source].get(key)
+            if items is None:
+                continue
+            print(f"\n{title}: {len(items)}")
+            for i, item in enumerate(items, 1):
+                print(f"  {i}. {label(item)}")
     else:
         print("No response received from backend")
 
@@ -0,0 +1,105 @@
+#!/usr/bin/env python3
+"""
+Tests for the shared TTLCache used in front of Text-to-CAD generation and cloud DFM analysis
+"""
+
+import time
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from unittest.mock import patch
+
+import ttl_cache
+from ttl_cache import TTLCache
+
+# Seconds a test waits on another thread before treating it as stuck
+WAIT_TIMEOUT = 5
+
+def run_concurrently(cache, key, compute, callers, should_cache=None):
+    """Call get_or_compute from several threads once compute has started, returning their results"""
+    started = threading.Event()
+    release = threading.Event()
+
+    def blocking_compute():
+        started.set()
+        assert release.wait(WAIT_TIMEOUT)
+        return compute()
+
+    kwargs = {} if should_cache is None else {"should_cache": should_cache}
+    with ThreadPoolExecutor(max_workers=callers) as executor:
+        first = executor.submit(cache.get_or_compute, key, blocking_compute, **kwargs)
+        assert started.wait(WAIT_TIMEOUT)
+        others = [executor.submit(cache.get_or_compute, key, blocking_compute, **kwargs)
+                  for _ in range(callers - 1)]
+
+        # Let the waiters queue up on the key before the first computation finishes
+        deadline = time.monotonic() + WAIT_TIMEOUT
+        while cache._in_flight[key][1] < callers:
+            assert time.monotonic() < deadline, "callers never queued on the key"
+            time.sleep(0.01)
+        release.set()
+        return [future.result(WAIT_TIMEOUT) for future in [first, *others]]
+
+def test_concurrent_callers_share_one_computation():
+    """Callers missing on the same key wait for a single compute call"""
+    cache = TTLCache(maxsize=8, ttl=60)
+    calls = []
+
+    def compute():
+        calls.append(1)
+        return {"success": True}
+
+    results = run_concurrently(cache, "gear", compute, callers=4)
+
+    assert len(calls) == 1
+    assert results == [{"success": True}] * 4
+    # The per-key lock is dropped once nobody is waiting on it
+    assert cache._in_flight == {}
+
+def test_rejected_result_is_recomputed_by_next_waiter():
+    """A result should_cache rejects isn't shared, so each waiter computes again"""
+    cache = TTLCache(maxsize=8, ttl=60)
+    calls = []
+
+    def compute():
+        calls.append(1)
+        return {"success": False, "attempt": len(calls)}
+
+    results = run_concurrently(cache, "gear", compute, callers=3,
+                               should_cache=lambda response: response["success"])
+
+    assert len(calls) == 3
+    assert sorted(result["attempt"] for result in results) == [1, 2, 3]
+    assert cache.get("gear") is None
+    assert cache._in_flight == {}
+
+def test_entries_expire_after_ttl():
+    """An entry is served until ttl seconds have passed, then dropped"""
+    cache = TTLCache(maxsize=8, ttl=60)
+    with patch.object(ttl_cache.time, "monotonic", return_value=1000.0):
+        cache.put("gear", "cached")
+
+    with patch.object(ttl_cache.time, "monotonic", return_value=1059.0):
+        assert cache.get("gear") == "cached"
+    with patch.object(ttl_cache.time, "monotonic", return_value=1060.0):
+        assert cache.get("gear") is None
+        assert cache.get_or_compute("gear", lambda: "fresh") == "fresh"
+
+def test_least_recently_used_entry_is_evicted():
+    """Storing beyond maxsize evicts the entry used least recently"""
+    cache = TTLCache(maxsize=2, ttl=60)
+    cache.put("a", 1)
+    cache.put("b", 2)
+    assert cache.get("a") == 1  # "b" is now the least recently used
+    cache.put("c", 3)
+
+    assert cache.get("b") is None
+    assert cache.get("a") == 1
+    assert cache.get("c") == 3
+
+if __name__ == "__main__":
+    for test in (test_concurrent_callers_share_one_computation,
+                 test_rejected_result_is_recomputed_by_next_waiter,
+                 test_entries_expire_after_ttl,
+                 test_least_recently_used_entry_is_evicted):
+        test()
+        print(f"✅ {test.__name__}")
@@ -0,0 +1,206 @@
+"""
+Shared helpers for the cloud test scripts
+Uses orjson for JSON encoding/decoding when it is installed and falls back to the stdlib json module
+Streamed responses are parsed incrementally with ijson when it is installed
+"""
+
+import os
+import json
+import time
+import importlib.util
+from functools import lru_cache
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from types import MappingProxyType
+from urllib.parse import urlsplit
+from unittest.mock import MagicMock
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+try:
+    import ijson
+except ImportError:
+    ijson = None
+
+# JSON request headers shared by the test scripts; read-only so no script can
+# change them for the others. Scripts add their own auth headers on top.
+HEADERS = MappingProxyType({
+    "Content-Type": "application/json",
+    "Accept": "application/json"
+})
+
+# cloud_config.json at the repository root, next to the test scripts
+CLOUD_CONFIG_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "cloud_config.json")
+
+# (connect, read) timeouts: connection failures surface after 2 s, while a
+# server that accepted the request gets longer to respond
+PROBE_TIMEOUT = (2, 8)
+ANALYSIS_TIMEOUT = (2, 30)
+
+@contextmanager
+def timed(label, report=print):
+    """Time the enclosed block and report "<label> in N.NN seconds" when it completes
+    
+    Uses the monotonic perf_counter_ns clock, so the measurement is unaffected by
+    system clock adjustments. Nothing is reported if the block raises.
+    """
+    start = time.perf_counter_ns()
+    yield
+    report(f"{label} in {(time.perf_counter_ns() - start) / 1e9:.2f} seconds")
+
+def make_session(headers=None) -> requests.Session:
+    """Create a requests session with a keep-alive connection pool
+    
+    Connections are reused across calls, so repeated probes against the same host
+    skip the TCP/TLS handshake. Connection failures and gateway errors (502/503/504)
+    are retried with a short backoff; once retries run out the last response is
+    returned as usual instead of raising.
+    """
+    session = requests.Session()
+    adapter = HTTPAdapter(
+        pool_connections=4,
+        pool_maxsize=16,
+        max_retries=Retry(
+            total=2,
+            connect=2,
+            backoff_factor=0.2,
+            status_forcelist=(502, 503, 504),
+            raise_on_status=False
+        )
+    )
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+    if headers:
+        session.headers.update(headers)
+    return session
+
+def encode_json(obj, indent: bool = False) -> bytes:
+    """Serialize an object to JSON bytes, ready to send as a request body or write to a file
+    
+    Output is compact unless indent is set, which pretty-prints with a 2-space indent
+    """
+    if orjson is not None:
+        return orjson.dumps(obj, option=orjson.OPT_INDENT_2 if indent else 0)
+    return json.dumps(obj, indent=2 if indent else None).encode('utf-8')
+
+def dumps_json(obj, indent: bool = False, default=None) -> str:
+    """Serialize an object to a JSON string, optionally pretty-printed with a 2-space indent
+    
+    default, if given, is called for objects that are not JSON serializable
+    """
+    if orjson is not None:
+        return orjson.dumps(obj, default=default, option=orjson.OPT_INDENT_2 if indent else 0).decode('utf-8')
+    return json.dumps(obj, indent=2 if indent else None, default=default)
+
+def decode_json(data):
+    """Parse JSON from bytes or str
+
+    Raises json.JSONDecodeError on invalid input (orjson's error type subclasses it)
+    """
+    if orjson is not None:
+        return orjson.loads(data)
+    if isinstance(data, (bytes, bytearray)):
+        data = data.decode('utf-8')
+    return json.loads(data)
+
+@lru_cache(maxsize=None)
+def load_cloud_config(path=CLOUD_CONFIG_PATH):
+    """Load and parse cloud_config.json, once per process for each path
+    
+    The returned dict is shared between callers, so treat it as read-only
+    """
+    with open(path, 'rb') as f:
+        return decode_json(f.read())
+
+@lru_cache(maxsize=None)
+def backend_alive(base_url):
+    """Return whether base_url answers its /health check, probing once per process
+    
+    Network-dependent tests call this first so a service that is down costs
+    one short probe rather than a full request timeout in every test
+    """
+    try:
+        return requests.get(f"{base_url}/health", timeout=PROBE_TIMEOUT).ok
+    except requests.exceptions.RequestException:
+        return False
+
+def iter_json_items(response):
+    """Yield the top-level (key, value) pairs of a JSON object response
+    
+    With ijson and a response requested with stream=True, each pair is yielded as
+    soon as it has arrived, so callers can start on the early fields while the rest
+    of the body is still downloading. Otherwise the whole body is parsed first.
+    """
+    if ijson is not None:
+        response.raw.decode_content = True
+        yield from ijson.kvitems(response.raw, '', use_float=True)
+    else:
+        yield from decode_json(response.content).items()
+
+# FreeCAD modules that the macro code imports, mocked when running outside FreeCAD
+FREECAD_MODULES = ('FreeCAD', 'Part', 'Mesh', 'MeshPart')
+
+@lru_cache(maxsize=1)
+def missing_freecad_modules():
+    """Return the FreeCAD modules that cannot be imported, searching sys.path only once"""
+    return tuple(name for name in FREECAD_MODULES if importlib.util.find_spec(name) is None)
+
+def freecad_module_mocks():
+    """Build MagicMock stand-ins for the FreeCAD modules that cannot be imported
+    
+    Meant for patch.dict(sys.modules, ...), so the mocks only exist while a test runs
+    """
+    return {name: MagicMock(name=name) for name in missing_freecad_modules()}
+
+def mock_response(status_code, json_data=None, text=""):
+    """Build a mock requests.Response whose raise_for_status behaves like the real one"""
+    response = MagicMock(spec=requests.Response)
+    response.status_code = status_code
+    response.ok = status_code < 400
+    response.text = text
+    response.json.return_value = json_data if json_data is not None else {}
+    if status_code >= 400:
+        response.raise_for_status.side_effect = requests.exceptions.HTTPError(
+            f"{status_code} Client Error: {text}", response=response
+        )
+    return response
+
+# The canned responses are built once and shared by every mocked call, so
+# callers must treat them (and their json() payloads) as read-only
+OK_HEALTH = mock_response(200, {"status": "ok"}, "OK")
+NOT_FOUND = mock_response(404, {"error": "Not Found"}, "Not Found")
+
+# GET routes keyed on the last path segment, since the configured API URL may
+# carry its own path prefix in front of the endpoint
+MOCK_GET_ROUTES = {"health": OK_HEALTH}
+
+def mock_cloud_get(url, **kwargs):
+    """Stand-in for requests.get: the health check succeeds, everything else is a 404"""
+    return MOCK_GET_ROUTES.get(urlsplit(url).path.rpartition("/")[2], NOT_FOUND)
+
+def mock_cloud_post(url, **kwargs):
+    """Stand-in for requests.post: every cloud analysis endpoint is a 404"""
+    return NOT_FOUND
+
+@dataclass(frozen=True)
+class MockBoundBox:
+    """Bounding box of the 100 x 50 x 25 mm test part"""
+    XLength: float = 100.0
+    YLength: float = 50.0
+    ZLength: float = 25.0
+
+@dataclass
+class MockDocument:
+    """Minimal stand-in for a FreeCAD document, enough for the analyzers' fallback path"""
+    Name: str = "TestPart"
+    Objects: list = field(default_factory=list)
+    
+    def getBoundBox(self):
+        return MockBoundBox()
@@ -4,18 +4,179 @@ Handles integration between the StandaloneCoPilot.FCMacro and the Text-to-CAD cl
 """
 
 import os
+import re
+import builtins
 import json
 import time
+import random
+import socket
+import logging
+import threading
 import traceback
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timezone
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.connection import HTTPConnection
+from urllib3.util.retry import Retry
+from functools import lru_cache
+from ttl_cache import TTLCache
 from typing import Dict, Any, Optional, List, Tuple, Callable
 
+# Optional: faster JSON encoding/decoding than the stdlib json module
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+# Optional: parse responses incrementally from the socket instead of buffering
+# the whole body first
+try:
+    import ijson
+except ImportError:
+    ijson = None
+
+# Routine progress messages go to the debug log and failures to warning/error,
+# so nothing is formatted unless its level is enabled
+logger = logging.getLogger(__name__)
+
+# Words that mark user input as a text-to-CAD request. They match anywhere in
+# the text, case-insensitively, so longer phrases already covered by a shorter
+# indicator (e.g. 'water bottle' by 'bottle') are left out.
+CAD_INDICATORS = (
+    # Creation verbs
+    'create', 'make', 'generate', 'build', 'design', 'model',
+    
+    # Object types
+    'bicycle', 'bike', 'chassis', 'frame',
+    'bottle', 'flask',
+    'gear', 'cog', 'sprocket',
+    'bracket', 'mount', 'holder', 'housing',
+    'shaft', 'pipe', 'tube', 'cylinder',
+    'box', 'cube', 'sphere', 'cone',
+    
+    # CAD terms
+    '3d', 'cad', 'part', 'component', 'assembly'
+)
+
+# Compiled once so each check is a single scan of the text
+CAD_INDICATOR_PATTERN = re.compile('|'.join(map(re.escape, CAD_INDICATORS)), re.IGNORECASE)
+
+# Text shorter than the shortest indicator cannot contain any of them
+MIN_CAD_INDICATOR_LENGTH = min(map(len, CAD_INDICATORS))
+
+# Seconds send_request waits for a running connection test before giving up
+PROBE_GRACE_PERIOD = 2.0
+
+# Seconds before a connection test that failed is repeated
+PROBE_RETRY_INTERVAL = 30
+
+# Used when the configuration doesn't name a Text-to-CAD endpoint
+DEFAULT_ENDPOINT = "https://text-to-cad-agent-xxx-uc.a.run.app"
+
+# Paths of the connection test requests, which use a short retry policy
+CONNECTION_TEST_PATHS = ('/health', '/list-capabilities')
+
+# Connections kept open to the Text-to-CAD service by each integration
+SESSION_POOL_SIZE = 8
+
+# Seconds a successful health check / capabilities listing is trusted before
+# the endpoint is asked again
+HEALTH_CACHE_TTL = 30
+CAPS_CACHE_TTL = 300
+
+# Connection state shared by every integration instance in the process:
+# endpoint -> healthy-until, and endpoint -> (expires_at, supported_parts, etag)
+_HEALTH_CACHE: Dict[str, float] = {}
+_CAPS_CACHE: Dict[str, Tuple[float, List[str], Optional[str]]] = {}
+
+# Successful generations are reused for the same prompt for RESULT_CACHE_TTL
+# seconds; keyed by (endpoint, user_id, description)
+RESULT_CACHE_TTL = 1800
+RESULT_CACHE_SIZE = 256
+_RESULT_CACHE = TTLCache(RESULT_CACHE_SIZE, RESULT_CACHE_TTL)
+
+# Modules generated code may import; anything else is refused
+ALLOWED_CODE_MODULES = frozenset({
+    'FreeCAD', 'FreeCADGui', 'Part', 'PartDesign', 'Sketcher', 'Draft', 'Mesh', 'MeshPart',
+    'math', 'random', 'time'
+})
+
+def _restricted_import(name, globals=None, locals=None, fromlist=(), level=0):
+    """__import__ for generated code that only admits ALLOWED_CODE_MODULES"""
+    if level or name.partition('.')[0] not in ALLOWED_CODE_MODULES:
+        raise ImportError(f"Import of '{name}' is not allowed in generated code")
+    return __import__(name, globals, locals, fromlist, level)
+
+# Builtins visible to generated code, built once and shared by every run.
+# This trims the namespace so generated code can't casually open files or
+# eval strings; it is NOT a security boundary. Allowed modules still carry
+# references to os (e.g. random._os) and getattr can walk dunder attributes,
+# so the code must come from a trusted service.
+CODE_BUILTINS = {name: getattr(builtins, name) for name in (
+    'abs', 'all', 'any', 'bool', 'callable', 'chr', 'classmethod', 'dict', 'divmod',
+    'enumerate', 'filter', 'float', 'format', 'frozenset', 'getattr', 'hasattr',
+    'int', 'isinstance', 'issubclass', 'iter', 'len', 'list', 'map', 'max', 'min',
+    'next', 'object', 'ord', 'pow', 'print', 'property', 'range', 'repr', 'reversed',
+    'round', 'set', 'setattr', 'slice', 'sorted', 'staticmethod', 'str', 'sum',
+    'super', 'tuple', 'type', 'zip', '__build_class__', 'NotImplemented',
+    'Exception', 'ArithmeticError', 'AttributeError', 'ImportError', 'IndexError',
+    'KeyError', 'LookupError', 'NameError', 'NotImplementedError', 'OSError',
+    'OverflowError', 'RuntimeError', 'StopIteration', 'TypeError', 'ValueError',
+    'ZeroDivisionError'
+)}
+CODE_BUILTINS['__import__'] = _restricted_import
+
+class JitteredRetry(Retry):
+    """Retry policy that adds up to 20% random jitter to each backoff
+    
+    Spreads out retries from clients that failed at the same moment instead of
+    having them all hit the service again in lockstep
+    """
+    
+    def get_backoff_time(self) -> float:
+        return super().get_backoff_time() * (1 + random.random() * 0.2)
+
+# Probe idle pooled connections so the OS and middleboxes don't drop them while
+# the user is between prompts. TCP_KEEPIDLE/TCP_KEEPINTVL are not available on
+# every platform, so only the options this one supports are set.
+KEEPALIVE_SOCKET_OPTIONS = HTTPConnection.default_socket_options + [
+    (socket.SOL_SOCKET, socket.SO_KEEPALIVE, 1)
+] + [
+    (socket.IPPROTO_TCP, getattr(socket, name), value)
+    for name, value in (('TCP_KEEPIDLE', 60), ('TCP_KEEPINTVL', 30))
+    if hasattr(socket, name)
+]
+
+class KeepAliveAdapter(HTTPAdapter):
+    """HTTPAdapter whose pooled connections enable TCP keep-alive"""
+    
+    def init_poolmanager(self, *args, **kwargs):
+        kwargs.setdefault('socket_options', KEEPALIVE_SOCKET_OPTIONS)
+        super().init_poolmanager(*args, **kwargs)
+
+@lru_cache(maxsize=64)
+def compile_freecad_code(source: str):
+    """Compile generated FreeCAD code, reusing the code object for repeated source
+    
+    Raises SyntaxError if the source is not valid Python
+    """
+    return compile(source, '<text2cad>', 'exec')
+
 class TextToCADIntegration:
     """
     Text-to-CAD Integration for FreeCAD Cloud Co-Pilot
     Handles communication with the Text-to-CAD cloud service and processes responses
     """
     
+    # Fixed attribute set; instances carry no __dict__
+    __slots__ = (
+        'config_path', 'cloud_client', 'config', 'connected', 'last_error',
+        'capabilities', 'endpoint', 'session', '_api_key', '_post_url',
+        '_payload_template', '_exec_globals_template', '_probe_thread',
+        '_probe_lock', '_next_probe_at'
+    )
+    
     def __init__(self, config_path: Optional[str] = None, cloud_client=None):
         """Initialize the Text-to-CAD integration
         
@@ -30,32 +191,96 @@ class TextToCADIntegration:
         self.last_error = None
         self.capabilities = []
         self.endpoint = None
-        self.session = requests.Session()
+        self._api_key = None
+        self._post_url = None
+        self._payload_template = {'client': 'freecad_macro'}  # Fields shared by every request
+        self._exec_globals_template = None  # Built on the first execute_freecad_code call
         
         # Load configuration
         self._load_configuration()
+        self.session = self._create_session(self.endpoint)
+        
+        # Authenticate every call on the session, the POST included
+        if self._api_key:
+            self.session.headers['Authorization'] = f"Bearer {self._api_key}"
+        
+        # Test the connection in the background so creating the integration never
+        # waits on the network; send_request waits briefly for it and starts a
+        # new one later if it failed
+        self._probe_lock = threading.Lock()
+        self._next_probe_at = 0.0
+        self._start_probe()
+        
+        logger.debug("Text-to-CAD Integration initialized, testing connection in the background")
+    
+    @staticmethod
+    def _create_session(endpoint: str) -> requests.Session:
+        """Create the HTTP session shared by every call to the Text-to-CAD service
+        
+        Connections are kept alive in a small pool, and TCP keep-alive stops them
+        from being dropped while the macro sits idle.
         
-        # Test connection
-        self.test_connection()
+        The generation POST is retried with jittered backoff only when it cannot
+        have reached the generator: connection failures and 502/503 from the
+        gateway. Read timeouts and 504s are not retried, because the generation
+        may already be running upstream. With the (5, 30) s POST timeout the
+        worst case is a few failed 5 s connects plus backoff before a single
+        30 s attempt.
         
-        print(f"Text-to-CAD Integration initialized, connected: {self.connected}")
+        The health and capabilities checks get their own adapter that retries a
+        failed connect once and nothing else, so a connection test stays short;
+        failed tests are repeated later by the integration instead.
+        """
+        session = requests.Session()
+        adapter = KeepAliveAdapter(
+            pool_connections=4,
+            pool_maxsize=SESSION_POOL_SIZE,
+            max_retries=JitteredRetry(
+                total=3,
+                read=0,
+                backoff_factor=0.5,
+                status_forcelist=(502, 503),
+                allowed_methods=frozenset({'GET', 'POST'}),
+                respect_retry_after_header=True,
+                raise_on_status=False
+            )
+        )
+        session.mount('https://', adapter)
+        session.mount('http://', adapter)
+        
+        # Longer prefixes win, so the connection test URLs use this adapter
+        probe_adapter = KeepAliveAdapter(
+            pool_maxsize=2,
+            max_retries=Retry(total=1, connect=1, read=0, status=0, raise_on_status=False)
+        )
+        for path in CONNECTION_TEST_PATHS:
+            session.mount(f"{endpoint}{path}", probe_adapter)
+        return session
     
     def _load_configuration(self):
         """Load configuration from file"""
         try:
             if self.config_path and os.path.exists(self.config_path):
-                with open(self.config_path, 'r') as f:
-                    self.config = json.load(f)
-                print("Text-to-CAD configuration loaded successfully")
+                if orjson is not None:
+                    with open(self.config_path, 'rb') as f:
+                        self.config = orjson.loads(f.read())
+                else:
+                    with open(self.config_path, 'r') as f:
+                        self.config = json.load(f)
+                logger.debug("Text-to-CAD configuration loaded successfully")
             else:
-                print("No configuration file found, using defaults")
+                logger.debug("No configuration file found, using defaults")
                 self.config = {
-                    "text_to_cad_endpoint": "https://text-to-cad-agent-xxx-uc.a.run.app",
+                    "text_to_cad_endpoint": DEFAULT_ENDPOINT,
                     "text_to_cad_api_key": None
                 }
         except Exception as e:
-            print(f"Error loading Text-to-CAD configuration: {str(e)}")
-            traceback.print_exc()
+            logger.exception("Error loading Text-to-CAD configuration: %s", e)
+        
+        # Known before the first connection test, so send_request's check is meaningful
+        self.endpoint = self.config.get("text_to_cad_endpoint", DEFAULT_ENDPOINT)
+        self._api_key = self.config.get("text_to_cad_api_key")
+        self._post_url = f"{self.endpoint}/text-to-cad"
     
     def test_connection(self) -> bool:
         """Test connection to the Text-to-CAD cloud service
@@ -69,65 +294,119 @@ class TextToCADIntegration:
             return True
             
         try:
-            endpoint = self.config.get("text_to_cad_endpoint", "https://text-to-cad-agent-xxx-uc.a.run.app")
-            api_key = self.config.get("text_to_cad_api_key")
+            endpoint = self.endpoint  # Set from the configuration on load
             
-            self.endpoint = endpoint  # Store endpoint for reference
+            logger.debug("Testing connection to %s...", endpoint)
             
-            headers = {}
-            if api_key:
-                headers['Authorization'] = f"Bearer {api_key}"
-                
-            print(f"Testing connection to {endpoint}...")
+            # Reuse recent results for this endpoint instead of probing it again
+            now = time.monotonic()
+            health_fresh = _HEALTH_CACHE.get(endpoint, 0) > now
+            cached_caps = _CAPS_CACHE.get(endpoint)
+            if health_fresh and cached_caps and cached_caps[0] > now:
+                self.connected = True
+                self.capabilities = list(cached_caps[1])
+                logger.debug("Using cached connection state for %s", endpoint)
+                return True
+            
+            # Let the server answer 304 if the capabilities haven't changed
+            capabilities_headers = {}
+            if cached_caps and cached_caps[2]:
+                capabilities_headers['If-None-Match'] = cached_caps[2]
+            
+            # The health and capabilities checks are independent, so send them
+            # together; the results are still handled health first
+            with ThreadPoolExecutor(max_workers=2) as executor:
+                health_future = None
+                if not health_fresh:
+                    health_future = executor.submit(self.session.get, f"{endpoint}/health", timeout=10)
+                capabilities_future = executor.submit(
+                    self.session.get, f"{endpoint}/list-capabilities",
+                    headers=capabilities_headers, timeout=10
+                )
                 
-            # Test health endpoint
-            response = requests.get(f"{endpoint}/health", headers=headers, timeout=10)
+                # Test health endpoint
+                response = health_future.result() if health_future else None
             
-            if response.status_code == 200:
+            if response is None or response.status_code == 200:
+                if response is not None:
+                    _HEALTH_CACHE[endpoint] = now + HEALTH_CACHE_TTL
                 self.connected = True
-                print(f"Connected successfully to {endpoint}")
+                logger.debug("Connected successfully to %s", endpoint)
                 
                 # Get capabilities
                 try:
-                    capabilities_response = requests.get(f"{endpoint}/list-capabilities", headers=headers, timeout=10)
-                    if capabilities_response.status_code == 200:
+                    capabilities_response = capabilities_future.result()
+                    if capabilities_response.status_code == 304 and cached_caps:
+                        # Unchanged on the server, so only the expiry moves
+                        _CAPS_CACHE[endpoint] = (now + CAPS_CACHE_TTL, cached_caps[1], cached_caps[2])
+                        self.capabilities = list(cached_caps[1])
+                        return True
+                    elif capabilities_response.status_code == 200:
                         data = capabilities_response.json()
                         self.capabilities = data.get('supported_parts', [])
+                        _CAPS_CACHE[endpoint] = (
+                            now + CAPS_CACHE_TTL,
+                            list(self.capabilities),
+                            capabilities_response.headers.get('ETag')
+                        )
                         return True
                     else:
-                        print(f"Failed to get capabilities: Status code {capabilities_response.status_code}")
+                        logger.warning("Failed to get capabilities: Status code %s", capabilities_response.status_code)
                         return False
                 except Exception as e:
-                    print(f"Error getting capabilities: {e}")
+                    logger.warning("Error getting capabilities: %s", e)
                     return False
             else:
                 self.last_error = f"Failed to connect to {endpoint}: Status code {response.status_code}"
-                print(self.last_error)
+                logger.error("%s", self.last_error)
                 return False
         except Exception as e:
             self.last_error = f"Error connecting to Text-to-CAD service: {e}"
-            print(self.last_error)
+            logger.error("%s", self.last_error)
             return False
     
-    def _test_connection(self) -> bool:
-        """Test the connection to the Text-to-CAD cloud service
+    def wait_for_connection(self, timeout: Optional[float] = None) -> bool:
+        """Wait for the background connection test
         
+        Args:
+            timeout: Seconds to wait at most, or None to wait until it finishes
+            
         Returns:
-            True if the connection is successful, False otherwise
+            bool: True if connected
         """
-        if not self.cloud_endpoint:
-            return False
+        if not self.connected and self._probe_thread.is_alive():
+            self._probe_thread.join(timeout)
+        return self.connected
+    
+    def _start_probe(self):
+        """Run test_connection on a background thread"""
+        self._probe_thread = threading.Thread(target=self._probe, daemon=True)
+        self._probe_thread.start()
+    
+    def _probe(self):
+        """Test the connection, holding off the next test for a while if it fails"""
+        if not self.test_connection():
+            self._next_probe_at = time.monotonic() + PROBE_RETRY_INTERVAL
+    
+    def _ensure_connected(self) -> bool:
+        """Wait briefly for a connection, restarting a failed connection test when due
         
-        try:
-            response = self.session.get(
-                f"{self.cloud_endpoint}/health",
-                timeout=5
-            )
-            
-            return response.status_code == 200
-        except Exception as e:
-            print(f"Error testing connection to Text-to-CAD service: {e}")
-            return False
+        Never blocks for longer than PROBE_GRACE_PERIOD. A failed test is repeated
+        at most once per PROBE_RETRY_INTERVAL, so a transient failure at startup
+        doesn't leave the integration disconnected
+        
+        Returns:
+            bool: True if connected
+        """
+        if self.connected:
+            return True
+        
+        # Callers arriving together share one test
+        with self._probe_lock:
+            if (not self.connected and not self._probe_thread.is_alive()
+                    and time.monotonic() >= self._next_probe_at):
+                self._start_probe()
+        return self.wait_for_connection(PROBE_GRACE_PERIOD)
     
     def is_text_to_cad_request(self, text: str) -> bool:
         """Detect if user input is a text-to-CAD request
@@ -138,24 +417,9 @@ class TextToCADIntegration:
         Returns:
             True if this should be routed to text-to-CAD agent
         """
-        cad_indicators = [
-            # Creation verbs
-            'create', 'make', 'generate', 'build', 'design', 'model',
-            
-            # Object types
-            'bicycle', 'bike', 'chassis', 'frame',
-            'bottle', 'water bottle', 'flask',
-            'gear', 'cog', 'sprocket',
-            'bracket', 'mount', 'holder', 'housing',
-            'shaft', 'pipe', 'tube', 'cylinder',
-            'box', 'cube', 'sphere', 'cone',
-            
-            # CAD terms
-            '3d', 'cad', 'model', 'part', 'component', 'assembly'
-        ]
-        
-        text_lower = text.lower()
-        return any(indicator in text_lower for indicator in cad_indicators)
+        if len(text) < MIN_CAD_INDICATOR_LENGTH:
+            return False
+        return CAD_INDICATOR_PATTERN.search(text) is not None
     
     def send_request(self, description: str, user_id: str = "freecad_user") -> Dict:
         """Send text-to-CAD request to cloud service
@@ -167,7 +431,19 @@ class TextToCADIntegration:
         Returns:
             Dict containing response from cloud service
         """
-        if not self.connected or not self.endpoint:
+        # Repeated prompts during iterative design are answered from the cache, and
+        # identical prompts sent at the same time share one upstream call
+        result = _RESULT_CACHE.get_or_compute(
+            (self.endpoint, user_id, description),
+            lambda: self._post_request(description, user_id),
+            should_cache=lambda response: bool(response.get('success'))
+        )
+        # Callers get their own copy so the cached response can't be changed
+        return dict(result)
+    
+    def _post_request(self, description: str, user_id: str) -> Dict:
+        """Post one text-to-CAD request to the cloud service, bypassing the cache"""
+        if not self._ensure_connected() or not self.endpoint:
             return {
                 "success": False,
                 "message": "Not connected to Text-to-CAD service",
@@ -176,20 +452,48 @@ class TextToCADIntegration:
             
         try:
             payload = {
+                **self._payload_template,
                 'description': description,
                 'user_id': user_id,
-                'client': 'freecad_macro',
                 'timestamp': self._get_timestamp()
             }
             
+            if orjson is not None:
+                body = {'data': orjson.dumps(payload), 'headers': {'Content-Type': 'application/json'}}
+            else:
+                body = {'json': payload}
+            
             response = self.session.post(
-                f"{self.endpoint}/text-to-cad",
-                json=payload,
-                timeout=30  # 30 second timeout
+                self._post_url,
+                timeout=(5, 30),  # 5 s to connect, 30 s for the generation
+                stream=True,
+                **body
             )
             
-            response.raise_for_status()
-            return response.json()
+            with response:
+                if response.status_code >= 400:
+                    return {
+                        'success': False,
+                        'message': f'HTTP error: {response.status_code}',
+                        'fallback_available': True
+                    }
+                if ijson is not None:
+                    # Generated code can be large; build the result straight from the
+                    # stream rather than holding the raw body and the parsed dict together
+                    response.raw.decode_content = True
+                    result = next(ijson.items(response.raw, '', use_float=True))
+                elif orjson is not None:
+                    result = orjson.loads(response.content)
+                else:
+                    result = response.json()
+            
+            if not isinstance(result, dict):
+                return {
+                    'success': False,
+                    'message': f'Unexpected response from cloud service: expected a JSON object, got {type(result).__name__}',
+                    'fallback_available': True
+                }
+            return result
             
         except requests.exceptions.Timeout:
             return {
@@ -205,13 +509,6 @@ class TextToCADIntegration:
                 'fallback_available': True
             }
             
-        except requests.exceptions.HTTPError as e:
-            return {
-                'success': False,
-                'message': f'HTTP error: {e.response.status_code}',
-                'fallback_available': True
-            }
-            
         except Exception as e:
             return {
                 'success': False,
@@ -219,6 +516,23 @@ class TextToCADIntegration:
                 'fallback_available': True
             }
     
+    def send_requests(self, descriptions: List[str], user_id: str = "freecad_user") -> List[Dict]:
+        """Send several text-to-CAD requests concurrently
+        
+        Args:
+            descriptions: Natural language descriptions, e.g. the parts of an assembly
+            user_id: User identifier
+            
+        Returns:
+            List of responses in the same order as descriptions
+        """
+        if not descriptions:
+            return []
+        
+        # One worker per pooled connection on the shared session
+        with ThreadPoolExecutor(max_workers=min(len(descriptions), SESSION_POOL_SIZE)) as executor:
+            return list(executor.map(lambda description: self.send_request(description, user_id), descriptions))
+    
     def execute_freecad_code(self, freecad_code: str, progress_callback: Optional[Callable] = None) -> Dict:
         """Execute FreeCAD Python code returned from cloud service
         
@@ -233,63 +547,83 @@ class TextToCADIntegration:
             if progress_callback:
                 progress_callback(" Executing CAD generation code...")
             
-            # Create a safe execution environment
-            exec_globals = {
-                'print': print
-            }
-            
-            # Try to import FreeCAD module - this should be available within FreeCAD environment
+            # Compile first so invalid code is reported before FreeCAD is touched
             try:
-                # When running inside FreeCAD, the FreeCAD module should already be in the global namespace
-                # First check if it's already available in globals
-                if 'FreeCAD' in globals():
-                    exec_globals['FreeCAD'] = globals()['FreeCAD']
-                else:
-                    # Try importing it
-                    import FreeCAD
-                    exec_globals['FreeCAD'] = FreeCAD
-            except ImportError as e:
+                code = compile_freecad_code(freecad_code)
+            except SyntaxError as e:
+                error_msg = f"Error executing FreeCAD code: invalid syntax at line {e.lineno}: {e.msg}"
                 if progress_callback:
-                    progress_callback(f" FreeCAD module not available: {str(e)}")
+                    progress_callback(f" {error_msg}")
                 return {
                     'success': False,
-                    'message': f'Error executing FreeCAD code: FreeCAD module not available - {str(e)}'
+                    'message': error_msg
                 }
             
-            # Try to import Part module
-            try:
-                # Check if Part is already in globals (should be when running in FreeCAD)
-                if 'Part' in globals():
-                    exec_globals['Part'] = globals()['Part']
-                else:
-                    import Part
-                    exec_globals['Part'] = Part
-            except ImportError as e:
-                if progress_callback:
-                    progress_callback(f" Part module not available: {str(e)}")
-                # Don't return error here as the code might not need Part module
+            # The module references don't change between calls, so collect them
+            # once and give each run its own shallow copy
+            if self._exec_globals_template is None:
+                # Create the execution environment (a trimmed namespace, not a sandbox)
+                template = {
+                    '__builtins__': CODE_BUILTINS,
+                    '__name__': '__text_to_cad__'
+                }
             
-            # Try to import FreeCADGui if available (for visualization)
-            try:
-                if 'FreeCADGui' in globals():
-                    exec_globals['FreeCADGui'] = globals()['FreeCADGui']
-                else:
-                    import FreeCADGui
-                    exec_globals['FreeCADGui'] = FreeCADGui
-            except ImportError:
-                # FreeCADGui might not be available in headless mode
-                pass
-                
-            # Add other commonly used modules
-            for module_name in ['math', 'random', 'time']:
+                # Try to import FreeCAD module - this should be available within FreeCAD environment
+                try:
+                    # When running inside FreeCAD, the FreeCAD module should already be in the global namespace
+                    # First check if it's already available in globals
+                    if 'FreeCAD' in globals():
+                        template['FreeCAD'] = globals()['FreeCAD']
+                    else:
+                        # Try importing it
+                        import FreeCAD
+                        template['FreeCAD'] = FreeCAD
+                except ImportError as e:
+                    if progress_callback:
+                        progress_callback(f" FreeCAD module not available: {str(e)}")
+                    return {
+                        'success': False,
+                        'message': f'Error executing FreeCAD code: FreeCAD module not available - {str(e)}'
+                    }
+            
+                # Try to import Part module
                 try:
-                    module = __import__(module_name)
-                    exec_globals[module_name] = module
+                    # Check if Part is already in globals (should be when running in FreeCAD)
+                    if 'Part' in globals():
+                        template['Part'] = globals()['Part']
+                    else:
+                        import Part
+                        template['Part'] = Part
+                except ImportError as e:
+                    if progress_callback:
+                        progress_callback(f" Part module not available: {str(e)}")
+                    # Don't return error here as the code might not need Part module
+            
+                # Try to import FreeCADGui if available (for visualization)
+                try:
+                    if 'FreeCADGui' in globals():
+                        template['FreeCADGui'] = globals()['FreeCADGui']
+                    else:
+                        import FreeCADGui
+                        template['FreeCADGui'] = FreeCADGui
                 except ImportError:
+                    # FreeCADGui might not be available in headless mode
                     pass
+                
+                # Add other commonly used modules
+                for module_name in ['math', 'random', 'time']:
+                    try:
+                        module = __import__(module_name)
+                        template[module_name] = module
+                    except ImportError:
+                        pass
+            
+                self._exec_globals_template = template
+            
+            exec_globals = dict(self._exec_globals_template)
             
             # Execute the generated code
-            exec(freecad_code, exec_globals)
+            exec(code, exec_globals)
             
             if progress_callback:
                 progress_callback(" CAD model generated successfully!")
@@ -311,13 +645,10 @@ class TextToCADIntegration:
                 'traceback': traceback.format_exc()
             }
     
-    def _get_timestamp(self) -> str:
-        """Get current timestamp in ISO format"""
-        try:
-            from datetime import datetime
-            return datetime.now().isoformat()
-        except:
-            return "unknown"
+    @staticmethod
+    def _get_timestamp() -> str:
+        """Get the current UTC timestamp in ISO format"""
+        return datetime.now(timezone.utc).isoformat()
             
     def handle_text_to_cad_request(self, text: str, progress_callback: Optional[Callable] = None) -> Dict:
         """Process user message with potential text-to-CAD routing
@@ -329,6 +660,14 @@ class TextToCADIntegration:
         Returns:
             Dict with processing results
         """
+        # Don't spend a cloud round trip on messages that aren't CAD requests
+        if not self.is_text_to_cad_request(text):
+            return {
+                'success': False,
+                'message': 'Not a Text-to-CAD request',
+                'fallback_available': True
+            }
+        
         if progress_callback:
             progress_callback(" Processing Text-to-CAD request...")
         
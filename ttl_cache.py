@@ -0,0 +1,72 @@
+"""
+In-process LRU cache with per-entry expiry
+Shared by the Text-to-CAD integration and the local DFM proxy
+"""
+
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Hashable, Optional
+
+class TTLCache:
+    """Thread-safe LRU cache whose entries expire ttl seconds after they are stored
+
+    None is never cached, so get returning None always means a miss.
+    """
+
+    def __init__(self, maxsize: int, ttl: float):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._entries = OrderedDict()  # key -> (expires_at, value), least recently used first
+        self._lock = threading.Lock()
+        self._in_flight = {}  # key -> [lock, waiters] while get_or_compute runs for it
+
+    def get(self, key: Hashable) -> Optional[Any]:
+        """Return the unexpired value for key, or None"""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            if entry[0] <= time.monotonic():
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            return entry[1]
+
+    def put(self, key: Hashable, value: Any):
+        """Store value for key, evicting the least recently used entries beyond maxsize"""
+        with self._lock:
+            self._entries[key] = (time.monotonic() + self.ttl, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+
+    def get_or_compute(self, key: Hashable, compute: Callable[[], Any],
+                       should_cache: Callable[[Any], bool] = lambda value: value is not None) -> Any:
+        """Return the cached value for key, calling compute() on a miss
+
+        Concurrent callers missing on the same key wait for one computation
+        instead of each running it. The result is stored only if should_cache
+        accepts it; otherwise the next waiter computes again.
+        """
+        value = self.get(key)
+        if value is not None:
+            return value
+
+        with self._lock:
+            in_flight = self._in_flight.setdefault(key, [threading.Lock(), 0])
+            in_flight[1] += 1
+        try:
+            with in_flight[0]:
+                # Another caller may have filled the entry while this one waited
+                value = self.get(key)
+                if value is None:
+                    value = compute()
+                    if should_cache(value):
+                        self.put(key, value)
+                return value
+        finally:
+            with self._lock:
+                in_flight[1] -= 1
+                if not in_flight[1]:
+                    del self._in_flight[key]
@@ -360,18 +360,20 @@ class ProductionCADAnalyzer:
                 
                 shape = obj.Shape
                 
-                # Volume and surface area
-                if hasattr(shape, 'Volume') and shape.Volume > 0:
-                    total_volume += shape.Volume
+                # Volume and surface area; Shape.Volume integrates over the
+                # geometry on every access, so read it once per shape
+                volume = getattr(shape, 'Volume', 0)
+                if volume > 0:
+                    total_volume += volume
                     total_surface_area += shape.Area
                     
                     # Center of mass
                     if hasattr(shape, 'CenterOfMass'):
                         com = shape.CenterOfMass
-                        center_mass_x += com.x * shape.Volume
-                        center_mass_y += com.y * shape.Volume  
-                        center_mass_z += com.z * shape.Volume
-                        mass_contributions += shape.Volume
+                        center_mass_x += com.x * volume
+                        center_mass_y += com.y * volume
+                        center_mass_z += com.z * volume
+                        mass_contributions += volume
                 
                 # Bounding box
                 if hasattr(shape, 'BoundBox'):
@@ -1950,7 +1952,8 @@ class ProductionCADAnalyzer:
             # If no material flow analysis, estimate from volume/surface area ratio
             if analysis["features"]["wall_thickness"]["avg"] == 0:
                 # Rough estimate for thin-walled parts: 2 * Volume / Surface Area
-                estimated_thickness = 2 * shape.Volume / shape.Area if shape.Area > 0 else 0
+                area = shape.Area
+                estimated_thickness = 2 * shape.Volume / area if area > 0 else 0
                 analysis["features"]["wall_thickness"]["avg"] = estimated_thickness
                 analysis["features"]["wall_thickness"]["min"] = estimated_thickness * 0.8  # Estimate
                 analysis["features"]["wall_thickness"]["max"] = estimated_thickness * 1.2  # Estimate